@@ -27,6 +27,24 @@ config.set_main_option("sqlalchemy.url", str(settings.DATABASE_URL))
 load_domain_models()
 target_metadata = Base.metadata
 
+# Columns whose server default lives only in the migrations: the model leaves it out so the
+# SQLite test schema stays portable, and autogenerate must not emit a drop for it
+_MIGRATION_ONLY_SERVER_DEFAULTS = {("user", "id")}
+
+
+def compare_server_default(
+    context,
+    inspected_column,
+    metadata_column,
+    inspected_default,
+    metadata_default,
+    rendered_metadata_default,
+):
+    if (metadata_column.table.name, metadata_column.name) in _MIGRATION_ONLY_SERVER_DEFAULTS:
+        return False
+    # None defers to alembic's built-in comparison
+    return None
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -61,7 +79,7 @@ def do_run_migrations(connection):
         connection=connection,
         target_metadata=target_metadata,
         compare_type=True,
-        compare_server_default=True,
+        compare_server_default=compare_server_default,
         )
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,27 @@
+"""user created_at id index
+
+Revision ID: 5d8a1c6e3b47
+Revises: c4e2b7d91a3f
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8a1c6e3b47'
+down_revision: Union[str, Sequence[str], None] = 'c4e2b7d91a3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_user_created_at_id', 'user', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_created_at_id', table_name='user')
@@ -0,0 +1,29 @@
+"""user id server default
+
+Revision ID: 9f4c2d7e1a68
+Revises: 5d8a1c6e3b47
+Create Date: 2026-10-15 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f4c2d7e1a68'
+down_revision: Union[str, Sequence[str], None] = '5d8a1c6e3b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # gen_random_uuid() is built into PostgreSQL 13+, no pgcrypto extension required
+    op.alter_column('user', 'id', server_default=sa.text('gen_random_uuid()'), existing_type=sa.UUID(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('user', 'id', server_default=None, existing_type=sa.UUID(), existing_nullable=False)
@@ -0,0 +1,30 @@
+"""user timestamp server defaults
+
+Revision ID: c4e2b7d91a3f
+Revises: a91813720fc4
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e2b7d91a3f'
+down_revision: Union[str, Sequence[str], None] = 'a91813720fc4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('user', 'created_at', server_default=sa.text('now()'), existing_type=sa.DateTime(timezone=True), existing_nullable=False)
+    op.alter_column('user', 'updated_at', server_default=sa.text('now()'), existing_type=sa.DateTime(timezone=True), existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('user', 'updated_at', server_default=None, existing_type=sa.DateTime(timezone=True), existing_nullable=False)
+    op.alter_column('user', 'created_at', server_default=None, existing_type=sa.DateTime(timezone=True), existing_nullable=False)
@@ -1,34 +1,51 @@
 from __future__ import annotations
 
 import importlib
-from functools import lru_cache
-from pathlib import Path
+from functools import cache, lru_cache
+from importlib.util import find_spec
 from pkgutil import iter_modules
 from fastapi import APIRouter
 from app.core.logging import logger
 
 _DOMAINS_PACKAGE = "app.domains"
 
-@lru_cache(maxsize=1)
-def _discover_domain_routers() -> tuple[APIRouter, ...]:
-    """Discover domain routers with caching to avoid repeated filesystem scanning"""
+def _discover_domain_route_modules() -> tuple[str, ...]:
+    """Scan the domains package for ``routes`` modules (development fallback)"""
     package = importlib.import_module(_DOMAINS_PACKAGE)
-    package_file = getattr(package, "__file__", None)
-    if not package_file:
+    package_paths = getattr(package, "__path__", None)
+    if not package_paths:
         return ()
 
-    package_path = Path(package_file).parent
-    routers: list[APIRouter] = []
+    module_paths: list[str] = []
 
-    for _, module_name, is_pkg in iter_modules([str(package_path)]):
+    # iter_modules only lists direct children, so nested packages are never imported here
+    for _, package_name, is_pkg in iter_modules(package_paths, prefix=f"{_DOMAINS_PACKAGE}."):
         if not is_pkg:
             continue
-        module_path = f"{_DOMAINS_PACKAGE}.{module_name}.routes"
-        try:
-            module = importlib.import_module(module_path)
-        except ModuleNotFoundError:
-            continue
+        module_path = f"{package_name}.routes"
+        # Probe first so domains without routes don't cost a raised ModuleNotFoundError
+        if find_spec(module_path) is not None:
+            module_paths.append(module_path)
+
+    return tuple(module_paths)
+
+
+def _domain_route_modules() -> tuple[str, ...]:
+    """Prefer the build-time manifest; scan the filesystem only when it is absent"""
+    try:
+        from app.api._manifest import DOMAIN_ROUTE_MODULES  # type: ignore[import-not-found]
+    except ModuleNotFoundError:
+        return _discover_domain_route_modules()
+    return DOMAIN_ROUTE_MODULES
+
+
+@lru_cache(maxsize=1)
+def _discover_domain_routers() -> tuple[APIRouter, ...]:
+    """Import domain routers once; later calls reuse the cached tuple"""
+    routers: list[APIRouter] = []
 
+    for module_path in _domain_route_modules():
+        module = importlib.import_module(module_path)
         router = getattr(module, "router", None)
         if isinstance(router, APIRouter):
             routers.append(router)
@@ -38,8 +55,9 @@ def _discover_domain_routers() -> tuple[APIRouter, ...]:
     return tuple(routers)
 
 
+@cache
 def build_api_router() -> APIRouter:
-    """Build the main API router by including all discovered domain routers"""
+    """Build the main API router once per process; every app instance reuses it"""
     api_router = APIRouter()
     for router in _discover_domain_routers():
         api_router.include_router(router)
@@ -1,45 +1,99 @@
 from __future__ import annotations
 
+import re
 from contextlib import asynccontextmanager
-from typing import Awaitable, Callable
-from uuid import uuid4
+from os import urandom
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from prometheus_fastapi_instrumentator import Instrumentator
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from fastapi.responses import ORJSONResponse
+from prometheus_fastapi_instrumentator import Instrumentator, metrics
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.api.health import router as health_router
 from app.api.router import build_api_router
 from app.core.config import settings
 from app.core.logging import logger, reset_request_context, setup_logging, update_request_context
-from app.db.session import engine, init_models
+from app.db.session import DBSessionMiddleware, engine, init_models
+from app.infra.cache import close_redis
 from app.infra.metrics.opentelemetry import ObservabilityController
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        request_id = request.headers.get("x-request-id") or str(uuid4())
-        trace_id = request.headers.get("x-trace-id") or str(uuid4())
-        request.state.request_id = request_id
-        update_request_context(
+_request_start_logger = logger.bind(event="request", stage="start")
+_lifespan_startup_logger = logger.bind(event="lifespan", stage="startup")
+_lifespan_shutdown_logger = logger.bind(event="lifespan", stage="shutdown")
+
+# Only the request latency histogram is scraped; registered once per process
+_LATENCY_METRIC = metrics.latency(should_include_handler=True, should_include_method=True, should_include_status=True)
+
+
+_PROBE_PATHS = frozenset((f"{settings.API_PREFIX}/health", "/metrics"))
+
+
+def _new_id() -> str:
+    """Opaque 128-bit correlation id, cheaper than formatting a UUID"""
+    return urandom(16).hex()
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware that binds request identifiers to the logging context"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        # Probe and scrape traffic needs no correlation ids or request logging
+        self._skip_paths = _PROBE_PATHS
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self._skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        request_id: str | None = None
+        trace_id: str | None = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+            elif name == b"x-trace-id":
+                trace_id = value.decode("latin-1")
+
+        if not request_id:
+            request_id = _new_id()
+        if not trace_id:
+            trace_id = _new_id()
+
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = update_request_context(
             request_id=request_id,
             trace_id=trace_id,
-            path=str(request.url.path),
-            method=request.method,
+            path=scope["path"],
+            method=scope["method"],
         )
-        logger.bind(event="request", stage="start").info("Handling request")
+        _request_start_logger.info("Handling request")
+
+        request_id_header = request_id.encode("latin-1")
+        trace_id_header = trace_id.encode("latin-1")
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = message.setdefault("headers", [])
+                if not isinstance(headers, list):
+                    headers = message["headers"] = list(headers)
+                has_request_id = has_trace_id = False
+                for name, _ in headers:
+                    lowered = name.lower()
+                    if lowered == b"x-request-id":
+                        has_request_id = True
+                    elif lowered == b"x-trace-id":
+                        has_trace_id = True
+                if not has_request_id:
+                    headers.append((b"x-request-id", request_id_header))
+                if not has_trace_id:
+                    headers.append((b"x-trace-id", trace_id_header))
+            await send(message)
+
         try:
-            response = await call_next(request)
-            response.headers.setdefault("x-request-id", request_id)
-            response.headers.setdefault("x-trace-id", trace_id)
-            return response
+            await self.app(scope, receive, send_wrapper)
         finally:
-            reset_request_context()
+            reset_request_context(token)
 
 
 def create_app() -> FastAPI:
@@ -50,11 +104,12 @@ def create_app() -> FastAPI:
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         observability.startup(app)
-        logger.bind(event="lifespan", stage="startup").info("Application startup")
+        _lifespan_startup_logger.info("Application startup")
         if settings.AUTO_CREATE_SCHEMA:
             await init_models()
         yield
-        logger.bind(event="lifespan", stage="shutdown").info("Application shutdown")
+        _lifespan_shutdown_logger.info("Application shutdown")
+        await close_redis()
         await observability.shutdown()
 
     app = FastAPI(
@@ -62,8 +117,11 @@ def create_app() -> FastAPI:
         debug=settings.DEBUG,
         version=settings.VERSION,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
+    # Added first so it sits inside RequestContextMiddleware and its logs carry request ids
+    app.add_middleware(DBSessionMiddleware, skip_paths=_PROBE_PATHS)
     app.add_middleware(RequestContextMiddleware)
     app.add_middleware(
         CORSMiddleware,
@@ -76,7 +134,12 @@ def create_app() -> FastAPI:
     app.include_router(health_router, prefix=settings.API_PREFIX)
     app.include_router(build_api_router(), prefix=settings.API_PREFIX)
 
-    Instrumentator(should_group_status_codes=True, should_ignore_untemplated=True).instrument(app).expose(
+    Instrumentator(
+        should_group_status_codes=True,
+        should_ignore_untemplated=True,
+        should_instrument_requests_inprogress=False,
+        excluded_handlers=[f"^{re.escape(settings.API_PREFIX)}/health$", "^/metrics$"],
+    ).add(_LATENCY_METRIC).instrument(app).expose(
         app,
         endpoint="/metrics",
         include_in_schema=False,
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Type
 
@@ -17,6 +18,8 @@ _ENVIRONMENT_CLASS_MAP: dict[str, EnvironmentSettings] = {
     "prod": ProductionSettings,
 }
 
+_ENV_HINT_PREFIX = "ENVIRONMENT="
+
 
 def _read_env_hint() -> str | None:
     """Try to discover ENVIRONMENT value from the filesystem before instantiation"""
@@ -25,26 +28,17 @@ def _read_env_hint() -> str | None:
     if candidate:
         return candidate
 
-    # Only read file if env var not set
-    env_file = Path(".env")
-    if not env_file.exists():
-        return None
-
-    # Read file once and parse efficiently
+    # Only read file if env var not set; stream it and stop at the first match
     try:
-        content = env_file.read_text(encoding="utf-8")
-        for line in content.splitlines():
-            stripped = line.strip()
-            # Skip empty lines and comments
-            if not stripped or stripped.startswith("#"):
-                continue
-            # Check for ENVIRONMENT key
-            if stripped.startswith("ENVIRONMENT="):
-                return stripped.split("=", 1)[1].strip()
+        with Path(".env").open("r", encoding="utf-8") as handle:
+            for line in handle:
+                stripped = line.strip()
+                if stripped.startswith(_ENV_HINT_PREFIX):
+                    return stripped[len(_ENV_HINT_PREFIX):].strip()
     except (OSError, UnicodeDecodeError):
-        # Gracefully handle file read errors
+        # Missing or unreadable file simply means no hint
         return None
-    
+
     return None
 
 
@@ -58,11 +52,18 @@ def _load_settings() -> AppBaseSettings:
     settings_cls = _ENVIRONMENT_CLASS_MAP.get(env_name, DevelopmentSettings)
 
     env_files = _collect_env_files(env_name)
-    configured_cls = settings_cls.with_env_files(env_files)
-    settings = configured_cls()  # type: ignore[call-arg]
+    # Override env files per instance so the settings class schema is built only once
+    env_file = tuple(str(path) for path in env_files) if env_files else settings_cls.default_env_files
+    settings = settings_cls(_env_file=env_file)  # type: ignore[call-arg]
     return settings
 
 
-settings: AppBaseSettings = _load_settings()
+@lru_cache(maxsize=1)
+def get_settings() -> AppBaseSettings:
+    """Process-wide settings; validated once, later calls are a cache hit"""
+    return _load_settings()
+
+
+settings: AppBaseSettings = get_settings()
 
-__all__ = ["settings", "AppBaseSettings", "DevelopmentSettings", "ProductionSettings"]
+__all__ = ["settings", "get_settings", "AppBaseSettings", "DevelopmentSettings", "ProductionSettings"]
@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-from pathlib import Path
-from typing import ClassVar, cast
+from typing import ClassVar, Literal, cast
 
-from pydantic import AnyUrl, Field, HttpUrl
+from pydantic import AnyUrl, Field, HttpUrl, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from app.core.version import get_app_version
@@ -25,6 +24,23 @@ class AppBaseSettings(BaseSettings):
         default=False,
         description="Create database schema on startup (development convenience only)",
     )
+    DB_POOL_SIZE: int = Field(default=5, ge=1, description="Persistent connections kept in the pool (ignored for SQLite)")
+    DB_MAX_OVERFLOW: int = Field(default=10, ge=0, description="Extra connections opened when the pool is exhausted")
+    DB_POOL_TIMEOUT_SECONDS: float = Field(
+        default=10.0,
+        gt=0.0,
+        description="Seconds to wait for a pooled connection before failing the request",
+    )
+    DB_POOL_RECYCLE_SECONDS: int = Field(
+        default=1800,
+        ge=-1,
+        description="Retire connections older than this; -1 disables recycling",
+    )
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        default=512,
+        ge=0,
+        description="asyncpg prepared statement cache size per connection; 0 disables it (needed behind PgBouncer transaction pooling)",
+    )
 
     # --- Server ---
     HOST: str = Field(default="0.0.0.0", description="Host interface exposed by ASGI server")
@@ -39,6 +55,10 @@ class AppBaseSettings(BaseSettings):
     # --- Logging ---
     LOG_LEVEL: str = Field(default="INFO", description="Base log level for the application stack")
     LOG_CONSOLE_ENABLED: bool = Field(default=True, description="Emit structured logs to stdout")
+    LOG_CONSOLE_ENQUEUE: bool = Field(
+        default=False,
+        description="Hand stdout logs to a background thread; only worth it when stdout is slow (e.g. blocking pipes)",
+    )
     AXIOM_LOGS_ENABLED: bool = Field(default=False, description="Forward logs to Axiom ingestion endpoint")
     AXIOM_DATASET_NAME: str = Field(default="production_loguru", description="Axiom dataset name for log ingestion", alias="AXIOM_DATASET")
     AXIOM_TRACES_DATASET_NAME: str = Field(
@@ -61,6 +81,7 @@ class AppBaseSettings(BaseSettings):
         ge=0.1,
         description="Flush interval for buffered log batches sent to Axiom",
     )
+    AXIOM_LOG_COMPRESSION: bool = Field(default=True, description="Gzip-compress log batches sent to Axiom")
     AXIOM_REQUEST_TIMEOUT_SECONDS: float = Field(default=5.0, gt=0.0, description="Timeout in seconds for Axiom HTTP requests")
 
     # --- Tracing ---
@@ -71,10 +92,37 @@ class AppBaseSettings(BaseSettings):
         le=1.0,
         description="Probability (0-1) of sampling new root spans",
     )
+    TRACING_SQLALCHEMY_SPANS: bool = Field(
+        default=False,
+        description="Emit a span per SQL statement; when off only a query duration histogram is recorded",
+    )
+    # Same names as the OpenTelemetry SDK's own batch span processor variables
+    OTEL_BSP_MAX_QUEUE_SIZE: int = Field(
+        default=4096,
+        ge=1,
+        description="Spans buffered before new ones are dropped; sized to absorb traffic bursts",
+    )
+    OTEL_BSP_SCHEDULE_DELAY: int = Field(default=1000, ge=1, description="Milliseconds between batch span exports")
+    OTEL_BSP_MAX_EXPORT_BATCH_SIZE: int = Field(default=256, ge=1, description="Maximum spans sent per export request")
+    OTEL_BSP_EXPORT_TIMEOUT: int = Field(default=10000, ge=1, description="Milliseconds allowed for one span export")
+    OTEL_EXPORTER_OTLP_COMPRESSION: Literal["gzip", "deflate", "none"] = Field(
+        default="gzip",
+        description="Body compression for OTLP span exports; 'none' trades bandwidth for exporter CPU",
+    )
 
     # --- Rate limiting ---
     RATE_LIMIT_ENABLED: bool = Field(default=False, description="Enable rate limiting for API endpoints")
-    REDIS_URL: str = Field(default="redis://localhost:6379/0", description="Redis URL for rate limiting backend")
+    REDIS_URL: str = Field(default="redis://localhost:6379/0", description="Redis URL for rate limiting and caching")
+
+    # --- Caching ---
+    USER_CACHE_ENABLED: bool = Field(default=False, description="Serve user lookups by id from a Redis read-through cache")
+    USER_CACHE_TTL_SECONDS: int = Field(default=60, ge=1, description="Lifetime of cached user entries in Redis")
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def resolved_traces_dataset(self) -> str:
+        """Dataset spans are exported to: the dedicated traces dataset, else the logs dataset"""
+        return self.AXIOM_TRACES_DATASET_NAME or self.AXIOM_DATASET_NAME
 
     # Allow subclasses to influence default env files
     default_env_files: ClassVar[tuple[str, ...]] = (".env",)
@@ -85,16 +133,3 @@ class AppBaseSettings(BaseSettings):
         case_sensitive=True,
         extra="ignore",
     )
-
-    @classmethod
-    def with_env_files(cls, env_files: list[Path] | None) -> type["AppBaseSettings"]:
-        class ConfiguredSettings(cls):  # type: ignore[misc, valid-type]
-            model_config = SettingsConfigDict(
-                env_file=tuple(str(path) for path in env_files) if env_files else cls.default_env_files,
-                env_file_encoding="utf-8",
-                case_sensitive=True,
-                extra="ignore",
-            )
-
-        ConfiguredSettings.__name__ = f"Configured{cls.__name__}"
-        return ConfiguredSettings
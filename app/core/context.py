@@ -1,59 +1,99 @@
 from __future__ import annotations
 
-from contextvars import ContextVar
+from contextvars import ContextVar, Token
+from functools import lru_cache
+from typing import NamedTuple
 
-request_id_ctx: ContextVar[str | None] = ContextVar("request_id", default=None)
-trace_id_ctx: ContextVar[str | None] = ContextVar("trace_id", default=None)
-path_ctx: ContextVar[str | None] = ContextVar("path", default=None)
-method_ctx: ContextVar[str | None] = ContextVar("method", default=None)
-user_id_ctx: ContextVar[str | None] = ContextVar("user_id", default=None)
 
+class RequestContext(NamedTuple):
+    """Fixed set of request-scoped fields; updates produce a new tuple via ``_replace``"""
 
-def reset_request_context() -> None:
-    request_id_ctx.set(None)
-    trace_id_ctx.set(None)
-    path_ctx.set(None)
-    method_ctx.set(None)
-    user_id_ctx.set(None)
+    request_id: str | None = None
+    trace_id: str | None = None
+    path: str | None = None
+    method: str | None = None
+    user_id: str | None = None
 
 
-def update_request_context(**kwargs: object) -> None:
-    if "request_id" in kwargs:
-        request_id_ctx.set(_stringify(kwargs["request_id"]))
-    if "trace_id" in kwargs:
-        trace_id_ctx.set(_stringify(kwargs["trace_id"]))
-    if "path" in kwargs:
-        path_ctx.set(_stringify(kwargs["path"]))
-    if "method" in kwargs:
-        method_ctx.set(_stringify(kwargs["method"]))
-    if "user_id" in kwargs:
-        user_id_ctx.set(_stringify(kwargs["user_id"]))
+_EMPTY_CONTEXT = RequestContext()
+_CONTEXT_FIELDS = frozenset(RequestContext._fields)
+
+# All request-scoped fields live in one immutable tuple: one set per update, one reset per request
+_request_ctx: ContextVar[RequestContext] = ContextVar("request_ctx", default=_EMPTY_CONTEXT)
+
+RequestContextToken = Token[RequestContext]
+
+
+class _ContextField:
+    """Read-only view over a single field of the request context"""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def get(self) -> str | None:
+        return getattr(_request_ctx.get(), self.name)
+
+
+request_id_ctx = _ContextField("request_id")
+trace_id_ctx = _ContextField("trace_id")
+path_ctx = _ContextField("path")
+method_ctx = _ContextField("method")
+user_id_ctx = _ContextField("user_id")
+
+
+def reset_request_context(token: RequestContextToken | None = None) -> None:
+    if token is not None:
+        _request_ctx.reset(token)
+    else:
+        _request_ctx.set(_EMPTY_CONTEXT)
+
+
+def update_request_context(**kwargs: object) -> RequestContextToken:
+    # Unknown keys are ignored, as before the NamedTuple: _replace would raise ValueError on them
+    updated = _request_ctx.get()._replace(
+        **{key: _stringify(value) for key, value in kwargs.items() if key in _CONTEXT_FIELDS}
+    )
+    return _request_ctx.set(updated)
 
 
 def get_request_context() -> dict[str, str]:
-    context = {
-        "request_id": request_id_ctx.get(),
-        "trace_id": trace_id_ctx.get(),
-        "path": path_ctx.get(),
-        "method": method_ctx.get(),
-        "user_id": user_id_ctx.get(),
-    }
-    return {key: value for key, value in context.items() if value}
+    return dict(get_request_context_items())
+
+
+def get_request_context_items() -> tuple[tuple[str, str], ...]:
+    """Populated context fields as immutable pairs, encoded once per context snapshot"""
+    context = _request_ctx.get()
+    if context is _EMPTY_CONTEXT:
+        # Startup and background logs: no hashing, no allocation
+        return ()
+    return _encode_context(context)
+
+
+@lru_cache(maxsize=1024)
+def _encode_context(context: RequestContext) -> tuple[tuple[str, str], ...]:
+    # Every log record within a request shares the same snapshot, so this hits the cache after the first record
+    return tuple((key, value) for key, value in zip(RequestContext._fields, context) if value)
 
 
 def _stringify(value: object | None) -> str | None:
-    if value is None:
-        return None
+    # Request ids, paths and methods already arrive as str; only UUIDs and the like need converting
+    if value is None or type(value) is str:
+        return value
     return str(value)
 
 
 __all__ = [
+    "RequestContext",
     "request_id_ctx",
     "trace_id_ctx",
     "path_ctx",
     "method_ctx",
     "user_id_ctx",
+    "RequestContextToken",
     "reset_request_context",
     "update_request_context",
     "get_request_context",
+    "get_request_context_items",
 ]
@@ -1,22 +1,27 @@
 from __future__ import annotations
 
 import atexit
-import json
 import logging
 import os
-import queue
 import socket
 import sys
 import threading
 import time
-from typing import Any, Final
+import zlib
+from collections import deque
+from datetime import datetime
+from types import MappingProxyType
+from itertools import islice
+from typing import Any, Final, Mapping
 
 import httpx
+import orjson
 from loguru import logger as _logger
 
 from app.core.config import settings
 from app.core.context import (
     get_request_context,
+    get_request_context_items,
     reset_request_context,
     update_request_context,
 )
@@ -34,6 +39,10 @@ def _get_static_extra() -> dict[str, str | int]:
     }
 
 _STATIC_EXTRA: Final = _get_static_extra()
+# Inner `"key":value,...` bytes of the static extras, spliced into every Axiom event at encode time
+_STATIC_EXTRA_JSON_FRAGMENT: Final = orjson.dumps(_STATIC_EXTRA)[1:-1]
+_AXIOM_JSON_OPTIONS: Final = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+_GZIP_HEADERS: Final = MappingProxyType({"Content-Encoding": "gzip"})
 
 _LOGGER_NAMES_TO_INTERCEPT: Final = (
     "uvicorn",
@@ -42,6 +51,65 @@ _LOGGER_NAMES_TO_INTERCEPT: Final = (
     "uvicorn.asgi",
     "sqlalchemy",
 )
+# Logger objects are process-wide singletons, so resolve them once rather than on every setup
+_INTERCEPT_LOGGERS: Final = tuple(logging.getLogger(name) for name in _LOGGER_NAMES_TO_INTERCEPT)
+
+
+class _LogEvent:
+    """Raw fields of one log record; the JSON-shaped dict is built on the drain thread"""
+
+    __slots__ = ("time", "message", "level", "logger", "function", "line", "extra")
+
+    def __init__(
+        self,
+        time: datetime,
+        message: str,
+        level: str,
+        logger: str | None,
+        function: str | None,
+        line: int | None,
+        extra: Mapping[str, Any] | None = None,
+    ) -> None:
+        self.time = time
+        self.message = message
+        self.level = level
+        self.logger = logger
+        self.function = function
+        self.line = line
+        self.extra = extra
+
+    def as_dict(self) -> dict[str, Any]:
+        event: dict[str, Any] = {
+            "_time": self.time,
+            "message": self.message,
+            "level": self.level,
+            "logger": self.logger,
+            "function": self.function,
+            "line": self.line,
+        }
+        extra = self.extra
+        if extra:
+            event.update(extra)
+            # Static extras are spliced in pre-encoded by _AxiomLogSink._build_ndjson
+            for key in _STATIC_EXTRA:
+                event.pop(key, None)
+        return event
+
+
+def _encode_stringified(event: dict[str, Any]) -> bytes | None:
+    """Encode ``event`` with every value orjson rejects replaced by its ``str()``; ``None`` if that fails too"""
+    safe: dict[str, Any] = {}
+    for key, value in event.items():
+        try:
+            orjson.dumps(value, default=str, option=_AXIOM_JSON_OPTIONS)
+        except TypeError:
+            value = str(value)
+        safe[key] = value
+    try:
+        return orjson.dumps(safe, default=str, option=_AXIOM_JSON_OPTIONS)
+    except TypeError as exc:
+        sys.stderr.write(f"Axiom log event could not be encoded, skipping it: {exc}\n")
+        return None
 
 
 class _AxiomLogSink:
@@ -54,147 +122,216 @@ class _AxiomLogSink:
         batch_size: int,
         flush_interval: float,
         timeout: float,
+        compress: bool = True,
     ) -> None:
-        self._endpoint = endpoint.rstrip("/")
-        self._headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/x-ndjson",
-            "X-Axiom-Dataset": dataset,
-        }
+        # Parsed once; httpx would otherwise re-parse the URL string on every flush
+        self._endpoint = httpx.URL(endpoint.rstrip("/"))
+        self._headers = MappingProxyType(
+            {
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/x-ndjson",
+                "X-Axiom-Dataset": dataset,
+            }
+        )
+        # Copying a pre-initialised gzip compressor per batch skips deflate setup
+        # while still emitting a self-contained gzip member for every request
+        self._gzip_template = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+        # Long-lived HTTP/2 client owned by the sink so flushes reuse one warm connection
+        self._client = httpx.Client(
+            timeout=timeout,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=4, max_connections=4, keepalive_expiry=60.0),
+            headers=self._headers,
+        )
         self._batch_size = batch_size
         self._flush_interval = flush_interval
         self._timeout = timeout
-        # Limit queue size to prevent unbounded memory growth (allow 40x batch size)
-        self._queue: "queue.Queue[dict[str, Any] | None]" = queue.Queue(maxsize=batch_size * 40)
+        # Single producer (loguru's enqueue worker) and single consumer (the drain thread):
+        # deque append/popleft are atomic, so no lock is taken per event.
+        # Limit ring size to prevent unbounded memory growth (allow 40x batch size)
+        self._capacity = batch_size * 40
+        self._ring: deque[_LogEvent] = deque()
+        self._wake = threading.Event()
+        self._closed = False
+        self._dropped = 0  # written by the producer only
+        self._reported_dropped = 0  # written by the drain thread only
         self._thread = threading.Thread(target=self._drain, name="axiom-log-sink", daemon=True)
         self._thread.start()
 
-    def __call__(self, message: "logging.LogRecord | Any") -> None:  # pragma: no cover - exercised via logging
-        try:
-            raw_record = message.record  # type: ignore[attr-defined]
-        except AttributeError:  # fallback when receiving stdlib records
-            level = getattr(message, "levelname", "INFO")
-            log_time = getattr(message, "created", time.time())
-            event: dict[str, Any] = {
-                "_time": log_time,
-                "message": getattr(message, "getMessage", lambda: str(message))(),
-                "level": level,
-                "logger": getattr(message, "name", "unknown"),
-                "function": getattr(message, "funcName", "<unknown>"),
-                "line": getattr(message, "lineno", 0),
-            }
-            extras: Any = {}
-        else:
-            level_field = raw_record.get("level")
-            if hasattr(level_field, "name"):
-                level_name = level_field.name
-            elif isinstance(level_field, dict):
-                level_name = level_field.get("name", "INFO")
-            else:
-                level_name = str(level_field or "INFO")
-
-            log_time = raw_record.get("time")
-            event = {
-                "_time": log_time.isoformat() if hasattr(log_time, "isoformat") else log_time,
-                "message": raw_record.get("message"),
-                "level": level_name,
-                "logger": raw_record.get("name"),
-                "function": raw_record.get("function"),
-                "line": raw_record.get("line"),
-            }
-            extras = raw_record.get("extra")
-
-        if isinstance(extras, dict):
-            event.update(extras)
+    def __call__(self, message: Any) -> None:
+        """Loguru sink entry point: ``message.record`` is always a loguru record"""
+        record = message.record
+        # Loguru hands every record its own ``extra`` dict, so it is kept by reference
+        self._push(
+            _LogEvent(
+                record["time"],
+                record["message"],
+                record["level"].name,
+                record["name"],
+                record["function"],
+                record["line"],
+                record["extra"],
+            )
+        )
 
-        try:
-            self._queue.put_nowait(event)
-        except queue.Full:
-            sys.stderr.write("Axiom log queue full; dropping log event\n")
+    def _push(self, event: _LogEvent) -> None:
+        ring = self._ring
+        if len(ring) >= self._capacity:
+            self._dropped += 1
+            return
+        ring.append(event)
+        if len(ring) >= self._batch_size:
+            self._wake.set()
 
     def close(self) -> None:
-        try:
-            self._queue.put_nowait(None)
-        except queue.Full:  # pragma: no cover - rare condition
-            sys.stderr.write("Axiom log queue full during shutdown; some logs may be lost\n")
+        self._closed = True
+        self._wake.set()
         self._thread.join(timeout=self._timeout)
+        if not self._thread.is_alive():
+            self._client.close()
 
     def _drain(self) -> None:
-        client = httpx.Client(timeout=self._timeout)
-        buffer: list[dict[str, Any]] = []
+        client = self._client
+        ring = self._ring
+        buffer: list[_LogEvent] = []
         next_flush = time.monotonic() + self._flush_interval
 
         try:
             while True:
-                timeout = max(0.0, next_flush - time.monotonic())
-                try:
-                    payload = self._queue.get(timeout=timeout)
-                except queue.Empty:
+                self._wake.wait(timeout=max(0.0, next_flush - time.monotonic()))
+                self._wake.clear()
+                closed = self._closed
+
+                # Move everything queued so far in one C-level pass; items appended
+                # concurrently stay in the ring for the next wakeup
+                buffer.extend(islice(iter(ring.popleft, None), len(ring)))
+
+                while len(buffer) >= self._batch_size:
+                    self._flush_batch(client, buffer[: self._batch_size])
+                    del buffer[: self._batch_size]
+
+                if closed or time.monotonic() >= next_flush:
+                    self._report_dropped()
                     if buffer:
                         self._flush_batch(client, buffer)
                         buffer.clear()
                     next_flush = time.monotonic() + self._flush_interval
-                    continue
-                except Exception as exc:  # pragma: no cover - catch unexpected queue errors
-                    sys.stderr.write(f"Axiom log drain error: {exc}\n")
-                    break
 
-                if payload is None:
-                    if buffer:
-                        self._flush_batch(client, buffer)
+                if closed:
                     break
-
-                buffer.append(payload)
-                if len(buffer) >= self._batch_size or time.monotonic() >= next_flush:
-                    self._flush_batch(client, buffer)
-                    buffer.clear()
-                    next_flush = time.monotonic() + self._flush_interval
+        except Exception as exc:  # pragma: no cover - catch unexpected drain errors
+            sys.stderr.write(f"Axiom log drain error: {exc}\n")
         finally:
             if buffer:
-                self._flush_batch(client, buffer)
-            client.close()
+                try:
+                    self._flush_batch(client, buffer)
+                except Exception as exc:  # pragma: no cover - last-chance flush must not raise
+                    sys.stderr.write(f"Axiom log final flush failed, dropping {len(buffer)} event(s): {exc}\n")
+
+    def _report_dropped(self) -> None:
+        dropped = self._dropped
+        if dropped != self._reported_dropped:
+            sys.stderr.write(f"Axiom log buffer full; dropped {dropped - self._reported_dropped} log event(s)\n")
+            self._reported_dropped = dropped
 
-    def _flush_batch(self, client: httpx.Client, batch: list[dict[str, Any]]) -> None:
+    def _flush_batch(self, client: httpx.Client, batch: list[_LogEvent]) -> None:
         if not batch:
             return
-        ndjson = "\n".join(json.dumps(item, default=str) for item in batch)
+        payload = self._build_ndjson(batch)
+        if not payload:
+            return
+        content, headers = self._encode(payload)
         try:
-            response = client.post(self._endpoint, content=ndjson, headers=self._headers)
+            response = client.post(self._endpoint, content=content, headers=headers)
             response.raise_for_status()
         except httpx.HTTPError as exc:  # pragma: no cover - network failures are rare in tests
             sys.stderr.write(f"Failed to deliver logs to Axiom: {exc}\n")
 
-class InterceptHandler(logging.Handler):
-    def emit(self, record: logging.LogRecord) -> None:  # noqa: D401
+    @staticmethod
+    def _build_ndjson(batch: list[_LogEvent]) -> bytearray:
+        # One growing buffer instead of N intermediate strings joined at the end;
+        # memoryview slicing drops each event's opening brace without copying it
+        prefix = b"{" + _STATIC_EXTRA_JSON_FRAGMENT + b","
+        dumps = orjson.dumps
+        buffer = bytearray()
+        for item in batch:
+            event = item.as_dict()
+            try:
+                encoded = dumps(event, default=str, option=_AXIOM_JSON_OPTIONS)
+            except TypeError:
+                # orjson rejects some values ``default`` never sees (ints wider than 64 bits);
+                # one bad event must not take the whole batch down with it
+                encoded = _encode_stringified(event)
+                if encoded is None:
+                    continue
+            if buffer:
+                buffer += b"\n"
+            buffer += prefix
+            buffer += memoryview(encoded)[1:]
+        return buffer
+
+    def _encode(self, payload: bytearray) -> tuple[bytes, Mapping[str, str] | None]:
+        if self._gzip_template is None:
+            return bytes(payload), None
+        try:
+            compressor = self._gzip_template.copy()
+            return compressor.compress(payload) + compressor.flush(), _GZIP_HEADERS
+        except zlib.error as exc:  # pragma: no cover - zlib failures are not expected
+            sys.stderr.write(f"Axiom log compression failed, sending uncompressed batch: {exc}\n")
+            return bytes(payload), None
+
+_LOGGING_FILE: Final = logging.__file__
+_logger_level = _logger.level
+_logger_opt = _logger.opt
+
+
+_LEVEL_CACHE: dict[str, str | int] = {}
+
+
+def _resolve_level(levelname: str, levelno: int) -> str | int:
+    """Map a stdlib level name to loguru's, memoized so steady state is one dict lookup"""
+    level = _LEVEL_CACHE.get(levelname)
+    if level is None:
         try:
-            level = _logger.level(record.levelname).name
+            level = _logger_level(levelname).name
         except ValueError:
-            level = record.levelno
+            level = levelno
+        _LEVEL_CACHE[levelname] = level
+    return level
+
+
+class InterceptHandler(logging.Handler):
+    def emit(self, record: logging.LogRecord) -> None:  # noqa: D401
+        level = _resolve_level(record.levelname, record.levelno)
 
         frame, depth = logging.currentframe(), 2
-        while frame and frame.f_code.co_filename == logging.__file__:  # check for logging module file
+        while frame and frame.f_code.co_filename == _LOGGING_FILE:  # skip frames inside the logging module
             frame = frame.f_back
             depth += 1
 
-        _logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+        _logger_opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
 
 
 def _setup_stdlib_logging(level: int) -> None:
     handler = InterceptHandler()  # custom handler to route stdlib logs to loguru
+    handler.setLevel(level)
     logging.basicConfig(handlers=[handler], level=level, force=True)
+    # Outside debug, a failing handler should not pay for (or spam) a stderr traceback
+    logging.raiseExceptions = settings.DEBUG
 
-    for name in _LOGGER_NAMES_TO_INTERCEPT:
-        std_logger = logging.getLogger(name)
-        std_logger.handlers = [handler]
+    for std_logger in _INTERCEPT_LOGGERS:
+        if std_logger.handlers:
+            std_logger.handlers.clear()
+        std_logger.addHandler(handler)
         std_logger.propagate = False
         std_logger.setLevel(level)
 
 
 def _patch_record(record: dict) -> None:
     """Inject request context into every log record"""
-    filtered = get_request_context()
-    if filtered:
-        record.setdefault("extra", {}).update(filtered)
+    items = get_request_context_items()
+    if items:
+        record["extra"].update(items)
 
 
 def _add_axiom_sink(level: int) -> None:
@@ -216,14 +353,16 @@ def _add_axiom_sink(level: int) -> None:
         batch_size=settings.AXIOM_LOG_BATCH_SIZE,
         flush_interval=settings.AXIOM_LOG_FLUSH_INTERVAL_SECONDS,
         timeout=settings.AXIOM_REQUEST_TIMEOUT_SECONDS,
+        compress=settings.AXIOM_LOG_COMPRESSION,
     )
     _logger.add(sink, level=level, serialize=False, enqueue=True)
     atexit.register(sink.close)
 
 
-def setup_logging() -> None:
+def setup_logging(*, force: bool = False) -> None:
+    """Configure sinks once per process; pass ``force=True`` to rebuild them (e.g. log-capture tests)"""
     global _LOGGER_CONFIGURED
-    if _LOGGER_CONFIGURED:
+    if _LOGGER_CONFIGURED and not force:
         return
 
     _logger.remove()
@@ -232,11 +371,13 @@ def setup_logging() -> None:
     level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
 
     if settings.LOG_CONSOLE_ENABLED:
+        # Synchronous stdout writes are cheaper than enqueue's pickle + queue hop per record;
+        # the Axiom sink keeps enqueue=True because its HTTP flush is genuinely slow
         _logger.add(
             sys.stdout,
             level=settings.LOG_LEVEL.upper(),
             serialize=True,
-            enqueue=True,
+            enqueue=settings.LOG_CONSOLE_ENQUEUE,
             backtrace=settings.DEBUG,
             diagnose=settings.DEBUG,
         )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+from datetime import datetime, timezone, tzinfo
 from functools import lru_cache
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
@@ -21,5 +21,23 @@ def get_timezone() -> ZoneInfo:
         return ZoneInfo(_DEFAULT_TIMEZONE)
 
 
+def _bind_timezone() -> tzinfo:
+    zone = get_timezone()
+    # The fixed-offset C singleton skips ZoneInfo's utcoffset lookup on every datetime.now
+    return timezone.utc if zone.key == "UTC" else zone
+
+
+# Resolved once: aware_now runs per row as an ORM column default
+_TZ: tzinfo = _bind_timezone()
+
+
+def refresh_timezone() -> tzinfo:
+    """Re-resolve the bound zone after ``settings.TIMEZONE`` changes (tests, config reloads)"""
+    global _TZ
+    get_timezone.cache_clear()
+    _TZ = _bind_timezone()
+    return _TZ
+
+
 def aware_now() -> datetime:
-    return datetime.now(get_timezone())
+    return datetime.now(_TZ)
@@ -8,9 +8,11 @@ environment variables in containerized environments.
 from __future__ import annotations
 
 import os
+from functools import cache
 from importlib.metadata import PackageNotFoundError, version
 
 
+@cache
 def get_app_version() -> str:
     """Retrieve the application version from package metadata or environment.
 
@@ -19,6 +21,9 @@ def get_app_version() -> str:
     2. Package metadata via importlib.metadata (derived from Git tags by Hatch-VCS)
     3. Fallback to "0.0.0-dev" for untagged development environments
 
+    The result is memoized: the metadata lookup walks ``sys.path`` on disk and
+    the version cannot change within a running process.
+
     Returns:
         str: Semantic version string (e.g., "1.2.3" or "0.0.0-dev")
 
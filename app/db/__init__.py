@@ -1,10 +1,11 @@
 from app.db.base import Base, metadata
-from app.db.session import AsyncSessionLocal, engine, get_session, init_models, load_domain_models
+from app.db.session import AsyncSessionLocal, DBSessionMiddleware, engine, get_session, init_models, load_domain_models
 
 __all__ = [
 	"Base",
 	"metadata",
 	"AsyncSessionLocal",
+	"DBSessionMiddleware",
 	"engine",
 	"get_session",
 	"init_models",
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator
+from functools import lru_cache
 from importlib import import_module
-from pathlib import Path
+from importlib.util import find_spec
 from pkgutil import iter_modules
+from typing import Any
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 from app.core.config import settings
 from app.core.logging import logger
 from app.db.base import Base
 
-_engine_kwargs = {
+_engine_kwargs: dict[str, Any] = {
     "echo": settings.DEBUG,
     "future": True,
 }
@@ -19,10 +22,19 @@ _engine_kwargs = {
 _db_url = str(settings.DATABASE_URL)
 if "sqlite" not in _db_url.lower():
     _engine_kwargs.update({
-        "pool_pre_ping": True,
-        "pool_size": 5,
-        "max_overflow": 10,  # Allow up to 10 additional connections when pool is exhausted
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,  # Extra connections allowed when the pool is exhausted
+        # Recycling is cheaper than pool_pre_ping's SELECT 1 on every checkout
+        # and still retires connections before typical idle-server timeouts
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,  # Fail fast instead of queueing requests behind an exhausted pool
     })
+if "asyncpg" in _db_url.lower():
+    _engine_kwargs["connect_args"] = {
+        # Short OLTP queries never benefit from JIT compilation, only pay its planning overhead
+        "server_settings": {"jit": "off"},
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
 
 engine = create_async_engine(_db_url, **_engine_kwargs)
 
@@ -32,33 +44,25 @@ AsyncSessionLocal = async_sessionmaker(
     class_=AsyncSession,
 )
 
-_models_loaded = False
-
+@lru_cache(maxsize=None)
 def _import_domain_modules(suffix: str) -> None:
-    """domain submodules need to be imported so SQLAlchemy registers models"""
+    """domain submodules need to be imported so SQLAlchemy registers models; runs once per suffix"""
     package = import_module("app.domains")
-    package_file = getattr(package, "__file__", None)
-    if not package_file:
+    package_paths = getattr(package, "__path__", None)
+    if not package_paths:
         return
 
-    package_path = Path(package_file).parent
-
-    for _, module_name, is_pkg in iter_modules([str(package_path)]):
+    for _, package_name, is_pkg in tuple(iter_modules(package_paths, prefix="app.domains.")):
         if not is_pkg:
             continue
-        module_path = f"app.domains.{module_name}.{suffix}"
-        try:
+        module_path = f"{package_name}.{suffix}"
+        if find_spec(module_path) is not None:
             import_module(module_path)
-        except ModuleNotFoundError:
-            continue
 
 
 def load_domain_models() -> None:
-    """Load domain models with caching to avoid repeated imports."""
-    global _models_loaded
-    if not _models_loaded:
-        _import_domain_modules("models")
-        _models_loaded = True
+    """Load domain models; repeated calls hit the import cache."""
+    _import_domain_modules("models")
 
 
 async def init_models() -> None:
@@ -74,11 +78,37 @@ async def init_models() -> None:
     logger.bind(action="init_models").info("Database schema created")
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        except SQLAlchemyError:
-            await session.rollback()
-            logger.exception("Database session rollback due to SQLAlchemyError")
-            raise
+_SESSION_STATE_KEY = "db_session"
+
+
+class DBSessionMiddleware:
+    """Open exactly one session per HTTP request and close it when the request finishes"""
+
+    def __init__(self, app: ASGIApp, *, skip_paths: frozenset[str] = frozenset()) -> None:
+        self.app = app
+        self._skip_paths = skip_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self._skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        async with AsyncSessionLocal() as session:
+            scope.setdefault("state", {})[_SESSION_STATE_KEY] = session
+            try:
+                await self.app(scope, receive, send)
+            except SQLAlchemyError:
+                await session.rollback()
+                logger.exception("Database session rollback due to SQLAlchemyError")
+                raise
+
+
+async def get_session(request: Request) -> AsyncSession:
+    """Return the session opened by :class:`DBSessionMiddleware` for this request
+
+    Async so FastAPI awaits it inline instead of dispatching it to the threadpool.
+    """
+    session = getattr(request.state, _SESSION_STATE_KEY, None)
+    if session is None:
+        raise RuntimeError("No database session on request state; is DBSessionMiddleware installed?")
+    return session
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, String
+from sqlalchemy import Boolean, DateTime, Index, String, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -12,6 +12,14 @@ from app.db.base import Base
 
 
 class User(Base):
+    # Fetch server-generated columns (updated_at's onupdate) via RETURNING during flush,
+    # so callers never need a follow-up refresh() SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+    # The Postgres column also defaults to gen_random_uuid() (see migrations) so bulk SQL and
+    # other writers can omit it; the ORM keeps generating ids client-side, which costs no
+    # round-trip and keeps the model portable to the SQLite test database. alembic/env.py
+    # tells autogenerate to leave that migration-only default alone
     id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True),
         primary_key=True,
@@ -23,15 +31,20 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=aware_now,
+        server_default=func.now(),
         nullable=False,
-        index=True,  # Index for efficient ordering in list queries
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=aware_now,
-        onupdate=aware_now,
+        server_default=func.now(),
+        onupdate=func.now(),  # rendered into the UPDATE, evaluated by the database
         nullable=False,
     )
 
 
+# Serves the list ordering (created_at DESC, id DESC) and its keyset cursor comparisons
+Index("ix_user_created_at_id", User.created_at, User.id)
+
+
 __all__ = ["User"]
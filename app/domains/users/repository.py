@@ -1,87 +1,223 @@
 from __future__ import annotations
 
-from typing import Sequence
+import asyncio
+from collections.abc import Mapping
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Final, Sequence
 from uuid import UUID
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import Row, Select, delete, func, select, tuple_, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from opentelemetry import trace
+from sqlalchemy.orm import make_transient_to_detached
 
+from app.core.config import settings
 from app.core.logging import logger
 from app.domains.users.models import User
+from app.infra.cache import RedisJSONCache
+from app.infra.metrics.opentelemetry import get_tracer
+
+# Spans are only opened when tracing is on; otherwise the shared no-op context skips the
+# Span object, context token and attribute dict each call would otherwise allocate, and
+# opentelemetry itself is never imported
+_TRACER: Final = get_tracer(__name__)
+_NO_SPAN: Final = nullcontext()
+
+# Bound once; per-call fields go through keyword arguments, which land in the record's extra
+# without bind() building a new Logger for every write
+_log: Final = logger.bind(component="users.repository")
+
+# The list page only feeds serialization, so it selects plain columns: rows skip ORM instance
+# construction, attribute instrumentation and identity-map bookkeeping entirely, and there is
+# nothing that could lazy-load per row
+_LIST_COLUMNS: Final = (User.id, User.email, User.is_active, User.created_at, User.updated_at)
+
+_USER_CACHE: Final = (
+    RedisJSONCache(namespace="user:id", ttl=settings.USER_CACHE_TTL_SECONDS) if settings.USER_CACHE_ENABLED else None
+)
+
+# Single-flight for get(): concurrent lookups of one id wait on the first caller's load and
+# adopt its row data into their own session instead of issuing their own query
+_INFLIGHT_GETS: dict[UUID, asyncio.Future[dict[str, Any] | None | object]] = {}
+_LOAD_FAILED: Final = object()
+
+
+def _to_cache_payload(user: User) -> dict[str, Any]:
+    return {
+        "id": user.id,
+        "email": user.email,
+        "is_active": user.is_active,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at,
+    }
+
+
+def _from_cache_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    """Decode the JSON form stored in Redis back to column values"""
+    return {
+        "id": UUID(payload["id"]),
+        "email": payload["email"],
+        "is_active": payload["is_active"],
+        "created_at": datetime.fromisoformat(payload["created_at"]),
+        "updated_at": datetime.fromisoformat(payload["updated_at"]),
+    }
+
+
+def _detached_user(values: dict[str, Any]) -> User:
+    user = User(**values)
+    # Present the row as already persisted so a session adopts it without a SELECT
+    make_transient_to_detached(user)
+    return user
+
 
 class UserRepository:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, cache: RedisJSONCache | None = None) -> None:
         self._session = session
-        self._tracer = trace.get_tracer(self.__class__.__module__)
+        self._cache = cache if cache is not None else _USER_CACHE
 
-    async def list(self, *, limit: int, offset: int) -> tuple[Sequence[User], int]:
-        with self._tracer.start_as_current_span(
-            "UserRepository.list",
-            attributes={"db.limit": limit, "db.offset": offset},
-        ):
-            items_stmt: Select[tuple[User]] = (
-                select(User)
-                .order_by(User.created_at.desc())
-                .offset(offset)
-                .limit(limit)
+    async def list(
+        self,
+        *,
+        limit: int,
+        offset: int = 0,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> tuple[Sequence[Row[Any]], int]:
+        """One page newest-first; ``after`` is a ``(created_at, id)`` keyset bound that replaces ``offset``"""
+        with (
+            _TRACER.start_as_current_span(
+                "UserRepository.list",
+                attributes={"db.limit": limit, "db.offset": offset, "db.keyset": after is not None},
             )
-            count_stmt = select(func.count(User.id))
+            if _TRACER is not None
+            else _NO_SPAN
+        ):
+            page_stmt: Select[Any]
+            if after is None:
+                # count(*) OVER () carries the unpaginated total on every row: one round-trip for both
+                page_stmt = select(*_LIST_COLUMNS, func.count().over().label("total")).offset(offset)
+            else:
+                # A window count would only see rows past the cursor; an uncorrelated scalar subquery
+                # is evaluated once and still reports the full total. The row-value comparison walks
+                # ix_user_created_at_id instead of scanning and discarding OFFSET rows
+                total_stmt = select(func.count()).select_from(User).scalar_subquery()
+                page_stmt = select(*_LIST_COLUMNS, total_stmt.label("total")).where(
+                    tuple_(User.created_at, User.id) < after
+                )
 
-            items_result = await self._session.scalars(items_stmt)
-            total_result = await self._session.scalar(count_stmt)
+            page_stmt = page_stmt.order_by(User.created_at.desc(), User.id.desc()).limit(limit)
 
-            items = items_result.all()
-            total = int(total_result or 0)
+            rows = (await self._session.execute(page_stmt)).all()
+            if rows:
+                return rows, int(rows[0].total)
 
-            return items, total
+            # Empty page (e.g. offset past the end): the total still has to come from somewhere
+            total_result = await self._session.scalar(select(func.count(User.id)))
+            return [], int(total_result or 0)
 
     async def get(self, user_id: UUID) -> User | None:
-        with self._tracer.start_as_current_span(
-            "UserRepository.get",
-            attributes={"user.id": str(user_id)},
+        with (
+            _TRACER.start_as_current_span("UserRepository.get", attributes={"user.id": str(user_id)})
+            if _TRACER is not None
+            else _NO_SPAN
         ):
+            pending = _INFLIGHT_GETS.get(user_id)
+            if pending is not None:
+                values = await asyncio.shield(pending)
+                if values is not _LOAD_FAILED:
+                    return await self._adopt(values) if values is not None else None  # type: ignore[arg-type]
+
+            future: asyncio.Future[dict[str, Any] | None | object] = asyncio.get_running_loop().create_future()
+            _INFLIGHT_GETS[user_id] = future
+            result: dict[str, Any] | None | object = _LOAD_FAILED  # waiters fall back to their own load
+            try:
+                user = await self._load(user_id)
+                result = _to_cache_payload(user) if user is not None else None
+                return user
+            finally:
+                future.set_result(result)
+                if _INFLIGHT_GETS.get(user_id) is future:
+                    del _INFLIGHT_GETS[user_id]
+
+    async def _load(self, user_id: UUID) -> User | None:
+        cache = self._cache
+        if cache is None:
             return await self._session.get(User, user_id)
 
-    async def get_by_email(self, email: str) -> User | None:
-        with self._tracer.start_as_current_span(
-            "UserRepository.get_by_email",
-            attributes={"user.email": email},
-        ):
-            stmt = select(User).where(User.email == email)
-            return await self._session.scalar(stmt)
+        cached = await cache.get(str(user_id))
+        if cached is not None:
+            return await self._adopt(_from_cache_payload(cached))
+
+        user = await self._session.get(User, user_id)
+        if user is not None:
+            await cache.set(str(user_id), _to_cache_payload(user))
+        return user
+
+    async def _adopt(self, values: dict[str, Any]) -> User:
+        """Attach row data loaded elsewhere; an instance this session already holds wins"""
+        existing = self._session.identity_map.get(self._session.identity_key(User, values["id"]))
+        if existing is not None:
+            return existing  # type: ignore[return-value]
+        # load=False attaches the state as-is, so later updates/deletes flush normally
+        return await self._session.merge(_detached_user(values), load=False)
 
     async def add(self, user: User) -> User:
-        with self._tracer.start_as_current_span(
-            "UserRepository.add",
-            attributes={"user.email": user.email, "user.is_active": user.is_active},
+        with (
+            _TRACER.start_as_current_span(
+                "UserRepository.add",
+                attributes={"user.email": user.email, "user.is_active": user.is_active},
+            )
+            if _TRACER is not None
+            else _NO_SPAN
         ):
             self._session.add(user)
-            await self._session.commit()
-            await self._session.refresh(user)
-            logger.bind(user_id=str(user.id)).info("User created")
+            try:
+                await self._session.commit()
+            except SQLAlchemyError:
+                await self._session.rollback()
+                raise
+            _log.info("User created", user_id=str(user.id))
             return user
 
-    async def update(self, user: User) -> User:
-        with self._tracer.start_as_current_span(
-            "UserRepository.update",
-            attributes={"user.id": str(user.id)},
+    async def update_by_id(self, user_id: UUID, changes: Mapping[str, Any]) -> User | None:
+        """``UPDATE ... RETURNING`` in one statement; ``None`` when no row has ``user_id``"""
+        with (
+            _TRACER.start_as_current_span("UserRepository.update_by_id", attributes={"user.id": str(user_id)})
+            if _TRACER is not None
+            else _NO_SPAN
         ):
-            await self._session.commit()
-            await self._session.refresh(user)
-            logger.bind(user_id=str(user.id)).info("User updated")
+            stmt = update(User).where(User.id == user_id).values(**changes).returning(User)
+            try:
+                user = (await self._session.execute(stmt)).scalar_one_or_none()
+                await self._session.commit()
+            except SQLAlchemyError:
+                await self._session.rollback()
+                raise
+            if user is None:
+                return None
+            if self._cache is not None:
+                await self._cache.delete(str(user_id))
+            _log.info("User updated", user_id=str(user_id))
             return user
 
-    async def delete(self, user: User) -> None:
-        with self._tracer.start_as_current_span(
-            "UserRepository.delete",
-            attributes={"user.id": str(user.id)},
+    async def delete_by_id(self, user_id: UUID) -> bool:
+        """``DELETE ... RETURNING id`` in one statement; ``False`` when no row has ``user_id``"""
+        with (
+            _TRACER.start_as_current_span("UserRepository.delete_by_id", attributes={"user.id": str(user_id)})
+            if _TRACER is not None
+            else _NO_SPAN
         ):
-            await self._session.delete(user)
+            stmt = delete(User).where(User.id == user_id).returning(User.id)
             try:
+                deleted = (await self._session.execute(stmt)).scalar_one_or_none()
                 await self._session.commit()
-                logger.bind(user_id=str(user.id)).info("User deleted")
             except SQLAlchemyError:
                 await self._session.rollback()
                 raise
+            if deleted is None:
+                return False
+            if self._cache is not None:
+                await self._cache.delete(str(user_id))
+            _log.info("User deleted", user_id=str(user_id))
+            return True
+
@@ -8,10 +8,19 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from app.core.dependencies import get_user_service
 from app.core.logging import logger, update_request_context
 from app.domains.users.schemas import UserCollection, UserCreate, UserRead, UserUpdate
-from app.domains.users.service import UserAlreadyExistsError, UserService
+from app.domains.users.service import InvalidCursorError, UserAlreadyExistsError, UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+_log = logger.bind(component="users.routes")
+
+
+def _json_response(model: UserRead | UserCollection, status_code: int = status.HTTP_200_OK) -> Response:
+    # response_model on the routes only documents the payload: a returned Response is passed through
+    # untouched, so the model is not validated and encoded a second time by FastAPI
+    return Response(content=model.model_dump_json(), status_code=status_code, media_type="application/json")
+
+
 async def _get_user_or_404(service: UserService, user_id: UUID):
     user = await service.get_user(user_id)
     if not user:
@@ -25,33 +34,46 @@ async def list_users_endpoint(
     service: Annotated[UserService, Depends(get_user_service)],
     limit: Annotated[int, Query(ge=1, le=100, description="Maximum number of users to return")] = 50,
     offset: Annotated[int, Query(ge=0, description="Number of users to skip before collecting results")] = 0,
-) -> UserCollection:
-    items, total = await service.list_users(limit=limit, offset=offset)
-    logger.bind(limit=limit, offset=offset).debug("Fetched users page")
-    payload = [UserRead.model_validate(item) for item in items]
-    return UserCollection(items=payload, total=total, limit=limit, offset=offset)
+    cursor: Annotated[
+        str | None,
+        Query(description="Opaque next_cursor from a previous page; cheaper than offset for deep pages"),
+    ] = None,
+) -> Response:
+    if cursor is not None and offset:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Use either cursor or offset, not both")
+    try:
+        items, total, next_cursor = await service.list_users(limit=limit, offset=offset, cursor=cursor)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor") from exc
+    _log.debug("Fetched users page", limit=limit, offset=offset)
+    # The whole page is validated from the ORM rows in one pydantic-core call
+    page = UserCollection.model_validate(
+        {"items": items, "total": total, "limit": limit, "offset": offset, "next_cursor": next_cursor},
+        from_attributes=True,
+    )
+    return _json_response(page)
 
 
 @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
 async def create_user_endpoint(
     payload: UserCreate,
     service: Annotated[UserService, Depends(get_user_service)],
-) -> UserRead:
+) -> Response:
     try:
         user = await service.create_user(payload)
     except UserAlreadyExistsError as exc:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered") from exc
     update_request_context(user_id=user.id)
-    return UserRead.model_validate(user)
+    return _json_response(UserRead.model_validate(user), status.HTTP_201_CREATED)
 
 
 @router.get("/{user_id}", response_model=UserRead)
 async def get_user_endpoint(
     user_id: UUID,
     service: Annotated[UserService, Depends(get_user_service)],
-) -> UserRead:
+) -> Response:
     user = await _get_user_or_404(service, user_id)
-    return UserRead.model_validate(user)
+    return _json_response(UserRead.model_validate(user))
 
 
 @router.patch("/{user_id}", response_model=UserRead)
@@ -59,17 +81,21 @@ async def update_user_endpoint(
     user_id: UUID,
     payload: UserUpdate,
     service: Annotated[UserService, Depends(get_user_service)],
-) -> UserRead:
-    user = await _get_user_or_404(service, user_id)
-    if not payload.model_dump(exclude_unset=True):
+) -> Response:
+    changes = payload.model_dump(exclude_unset=True)
+    if not changes:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No fields provided for update")
 
+    # The UPDATE doubles as the existence check: no SELECT before the write
     try:
-        updated = await service.update_user(user, payload)
+        updated = await service.update_user_by_id(user_id, changes)
     except UserAlreadyExistsError as exc:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered") from exc
+    if updated is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    update_request_context(user_id=user_id)
 
-    return UserRead.model_validate(updated)
+    return _json_response(UserRead.model_validate(updated))
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -77,6 +103,7 @@ async def delete_user_endpoint(
     user_id: UUID,
     service: Annotated[UserService, Depends(get_user_service)],
 ) -> Response:
-    user = await _get_user_or_404(service, user_id)
-    await service.delete_user(user)
+    if not await service.delete_user_by_id(user_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    update_request_context(user_id=user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
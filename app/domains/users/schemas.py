@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any
 from uuid import UUID
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 class UserBase(BaseModel):
     email: EmailStr = Field(max_length=255)
@@ -14,13 +15,23 @@ class UserCreate(UserBase):
 
 
 class UserUpdate(BaseModel):
+    # ``None`` only means "not sent"; both columns are NOT NULL, so an explicit null is rejected
     email: EmailStr | None = Field(default=None, max_length=255)
     is_active: bool | None = None
 
+    @field_validator("email", "is_active", mode="before")
+    @classmethod
+    def _reject_null(cls, value: Any) -> Any:
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
 
 class UserRead(BaseModel):
     id: UUID
-    email: EmailStr
+    # Rows were validated as EmailStr on the way in; re-running email-validator for every
+    # serialized row (whole list pages) buys nothing, so only the schema format is kept
+    email: str = Field(json_schema_extra={"format": "email"})
     is_active: bool
     created_at: datetime
     updated_at: datetime
@@ -33,5 +44,6 @@ class UserCollection(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: str | None = None
 
     model_config = ConfigDict(from_attributes=True)
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Mapping
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Final
 from uuid import UUID
 
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from opentelemetry import trace
 
 from app.domains.users.models import User
 from app.domains.users.repository import UserRepository
-from app.domains.users.schemas import UserCreate, UserUpdate
+from app.domains.users.schemas import UserCreate
+from app.infra.metrics.opentelemetry import get_tracer
+
+_TRACER: Final = get_tracer(__name__)
+_NO_SPAN: Final = nullcontext()
 
 class UserAlreadyExistsError(Exception):
     """Raised when attempting to create a user with a duplicate identifier"""
@@ -17,59 +28,112 @@ class UserAlreadyExistsError(Exception):
         super().__init__(f"User with email '{email}' already exists")
 
 
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+    def __init__(self, cursor: str) -> None:
+        self.cursor = cursor
+        super().__init__("Invalid pagination cursor")
+
+
+def _encode_cursor(row: Any) -> str:
+    """``row`` is any object exposing ``created_at`` and ``id`` (list rows or ``User`` instances)"""
+    raw = f"{row.created_at.isoformat()}|{row.id}".encode()
+    return urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, user_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(user_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError(cursor) from exc
+
+
+def _is_unique_violation(exc: IntegrityError) -> bool:
+    # PostgreSQL drivers expose SQLSTATE 23505; SQLite only names the failure in its message
+    orig = exc.orig
+    return getattr(orig, "sqlstate", None) == "23505" or "UNIQUE constraint failed" in str(orig)
+
+
 class UserService:
     def __init__(self, repository: UserRepository) -> None:
         self._repository = repository
-        self._tracer = trace.get_tracer(self.__class__.__module__)
 
     @classmethod
     def from_session(cls, session: AsyncSession) -> "UserService":
         return cls(UserRepository(session))
 
-    async def list_users(self, *, limit: int, offset: int) -> tuple[list[User], int]:
-        with self._tracer.start_as_current_span(
-            "UserService.list_users",
-            attributes={"app.pagination.limit": limit, "app.pagination.offset": offset},
+    async def list_users(
+        self,
+        *,
+        limit: int,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> tuple[list[Row[Any]], int, str | None]:
+        """Return ``(items, total, next_cursor)``; ``next_cursor`` is ``None`` once a page comes back short"""
+        with (
+            _TRACER.start_as_current_span(
+                "UserService.list_users",
+                attributes={"app.pagination.limit": limit, "app.pagination.offset": offset},
+            )
+            if _TRACER is not None
+            else _NO_SPAN
         ):
-            items, total = await self._repository.list(limit=limit, offset=offset)
-        return list(items), total
+            after = _decode_cursor(cursor) if cursor is not None else None
+            items, total = await self._repository.list(limit=limit, offset=offset, after=after)
+        next_cursor = _encode_cursor(items[-1]) if len(items) == limit else None
+        return list(items), total, next_cursor
 
     async def get_user(self, user_id: UUID) -> User | None:
-        with self._tracer.start_as_current_span(
-            "UserService.get_user",
-            attributes={"user.id": str(user_id)},
+        with (
+            _TRACER.start_as_current_span("UserService.get_user", attributes={"user.id": str(user_id)})
+            if _TRACER is not None
+            else _NO_SPAN
         ):
             return await self._repository.get(user_id)
 
     async def create_user(self, payload: UserCreate) -> User:
-        with self._tracer.start_as_current_span(
-            "UserService.create_user",
-            attributes={"user.email": payload.email, "user.is_active": payload.is_active},
+        with (
+            _TRACER.start_as_current_span(
+                "UserService.create_user",
+                attributes={"user.email": payload.email, "user.is_active": payload.is_active},
+            )
+            if _TRACER is not None
+            else _NO_SPAN
         ):
-            existing = await self._repository.get_by_email(payload.email)
-            if existing:
-                raise UserAlreadyExistsError(payload.email)
-
+            # The unique email indexes arbitrate duplicates atomically: no pre-check SELECT, no race window
             user = User(email=payload.email, is_active=payload.is_active)
-            return await self._repository.add(user)
-
-    async def update_user(self, user: User, payload: UserUpdate) -> User:
-        data = payload.model_dump(exclude_unset=True)
-        attributes = {"user.id": str(user.id), "user.updates": list(data.keys())}
-        with self._tracer.start_as_current_span("UserService.update_user", attributes=attributes):
-            if "email" in data and data["email"] != user.email:
-                existing = await self._repository.get_by_email(data["email"])
-                if existing and existing.id != user.id:
-                    raise UserAlreadyExistsError(data["email"])
-
-            for field, value in data.items():
-                setattr(user, field, value)
-
-            return await self._repository.update(user)
-
-    async def delete_user(self, user: User) -> None:
-        with self._tracer.start_as_current_span(
-            "UserService.delete_user",
-            attributes={"user.id": str(user.id)},
+            try:
+                return await self._repository.add(user)
+            except IntegrityError as exc:
+                if not _is_unique_violation(exc):
+                    raise
+                raise UserAlreadyExistsError(payload.email) from exc
+
+    async def update_user_by_id(self, user_id: UUID, changes: Mapping[str, Any]) -> User | None:
+        """Apply ``changes`` without loading the row first; ``None`` when the user does not exist"""
+        with (
+            _TRACER.start_as_current_span(
+                "UserService.update_user_by_id",
+                attributes={"user.id": str(user_id), "user.updates": list(changes.keys())},
+            )
+            if _TRACER is not None
+            else _NO_SPAN
+        ):
+            try:
+                return await self._repository.update_by_id(user_id, changes)
+            except IntegrityError as exc:
+                if "email" not in changes or not _is_unique_violation(exc):
+                    raise
+                raise UserAlreadyExistsError(changes["email"]) from exc
+
+    async def delete_user_by_id(self, user_id: UUID) -> bool:
+        with (
+            _TRACER.start_as_current_span("UserService.delete_user_by_id", attributes={"user.id": str(user_id)})
+            if _TRACER is not None
+            else _NO_SPAN
         ):
-            await self._repository.delete(user)
+            return await self._repository.delete_by_id(user_id)
+
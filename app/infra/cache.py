@@ -0,0 +1,68 @@
+"""Redis-backed read-through cache helpers
+
+One connection pool per process, created lazily on first use and closed from
+the application lifespan. Cache failures never fail a request: Redis errors are
+logged and treated as misses.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.logging import logger
+
+_log = logger.bind(component="cache")
+
+_client: Redis | None = None
+
+
+def get_redis() -> Redis:
+    """Process-wide client; the underlying pool reuses connections across requests"""
+    global _client
+    if _client is None:
+        _client = Redis.from_url(settings.REDIS_URL)
+    return _client
+
+
+async def close_redis() -> None:
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+
+
+class RedisJSONCache:
+    """JSON documents stored under ``{namespace}:{key}`` with a fixed TTL"""
+
+    def __init__(self, *, namespace: str, ttl: int) -> None:
+        self._prefix = f"{namespace}:"
+        self._ttl = ttl
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        try:
+            raw = await get_redis().get(self._prefix + key)
+        except RedisError as exc:
+            _log.warning("Cache read failed: {}", exc, cache_key=self._prefix + key)
+            return None
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Mapping[str, Any]) -> None:
+        try:
+            await get_redis().set(self._prefix + key, orjson.dumps(value), ex=self._ttl)
+        except RedisError as exc:
+            _log.warning("Cache write failed: {}", exc, cache_key=self._prefix + key)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await get_redis().delete(self._prefix + key)
+        except RedisError as exc:
+            _log.warning("Cache invalidation failed: {}", exc, cache_key=self._prefix + key)
+
+
+__all__ = ["RedisJSONCache", "close_redis", "get_redis"]
@@ -6,17 +6,83 @@ instrumentation when observability requirements mature
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import inspect
+import sys
+import threading
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING, Awaitable, Callable
+from weakref import WeakSet
 
 from app.core.config import AppBaseSettings, settings as global_settings
 
 if TYPE_CHECKING:
     from fastapi import FastAPI
+    from opentelemetry.context import Context
     from opentelemetry.sdk.trace.export import SpanExporter
+    from opentelemetry.trace import Span, Tracer
+    from prometheus_client import Histogram
     from sqlalchemy.ext.asyncio import AsyncEngine
 
 _TRACER_CONFIGURED = False
-_INSTRUMENTED_APPS: set[int] = set()
+_TRACER_LOCK = threading.Lock()
+_HTTPX_INSTRUMENTED = False
+# Weak so apps built and dropped by dev reloads or tests are not kept alive by the tracker
+_INSTRUMENTED_APPS: "WeakSet[FastAPI]" = WeakSet()
+_QUERY_DURATION: "Histogram | None" = None
+_QUERY_OPERATIONS = frozenset(("SELECT", "INSERT", "UPDATE", "DELETE"))
+
+
+def get_tracer(name: str, *, settings: AppBaseSettings | None = None) -> "Tracer | None":
+    """Tracer for module-level use, or ``None`` when tracing is disabled.
+
+    Returning ``None`` keeps ``opentelemetry`` out of ``sys.modules`` for processes
+    that never emit spans; callers fall back to a no-op context manager.
+    """
+
+    cfg = settings or global_settings
+    if not cfg.TRACING_ENABLED:
+        return None
+
+    from opentelemetry import trace
+
+    return trace.get_tracer(name)
+
+
+@asynccontextmanager
+async def aspan(
+    name: str,
+    parent_ctx: "Context | None" = None,
+    *,
+    tracer: "Tracer | None" = None,
+) -> AsyncIterator["Span | None"]:
+    """Span that is started and ended without ever becoming the current span.
+
+    Unlike ``start_as_current_span`` this never attaches to or detaches from the global
+    context, so concurrent handlers do not contend on it. Extract the parent once per
+    request (``propagate.extract(request.headers)``) and pass it to every ``aspan`` in
+    that request; children are parented explicitly with ``trace.set_span_in_context``.
+    Yields ``None`` when tracing is disabled.
+    """
+
+    tracer = tracer or get_tracer(__name__)
+    if tracer is None:
+        yield None
+        return
+
+    from opentelemetry.trace import Status, StatusCode
+
+    span = tracer.start_span(name, context=parent_ctx)
+    try:
+        yield span
+    except Exception as exc:
+        span.record_exception(exc)
+        span.set_status(Status(StatusCode.ERROR, str(exc)))
+        raise
+    finally:
+        span.end()
 
 
 def configure_tracing(
@@ -27,10 +93,11 @@ def configure_tracing(
 ) -> Callable[[], None] | None:
     """Configure the global tracer provider and return a shutdown hook.
 
-    The function is idempotent: subsequent calls reuse the existing provider.
+    The function is idempotent and thread-safe: subsequent calls reuse the existing provider.
     """
 
     from opentelemetry import propagate, trace
+    from opentelemetry.exporter.otlp.proto.http import Compression
     from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
     from opentelemetry.sdk.resources import Resource
     from opentelemetry.sdk.trace import TracerProvider
@@ -42,77 +109,91 @@ def configure_tracing(
     from opentelemetry.baggage.propagation import W3CBaggagePropagator
 
     global _TRACER_CONFIGURED
-    if _TRACER_CONFIGURED:
-        return lambda: None
-
-    cfg = settings or global_settings
-    if not cfg.TRACING_ENABLED:
-        return None
-
-    # Use dedicated traces dataset if configured, otherwise fall back to main dataset
-    dataset = cfg.AXIOM_TRACES_DATASET_NAME or cfg.AXIOM_DATASET_NAME
-    api_key = cfg.AXIOM_API_KEY.strip()
-    if not api_key:
-        raise RuntimeError("Tracing enabled but AXIOM_API_KEY is missing")
-    if not dataset:
-        raise RuntimeError("Tracing enabled but no Axiom dataset configured (AXIOM_DATASET or AXIOM_TRACES_DATASET required)")
-
-    resource = Resource.create(
-        {
-            SERVICE_NAME: service_name or cfg.APP_NAME,
-            SERVICE_VERSION: cfg.VERSION,
-            ResourceAttributes.DEPLOYMENT_ENVIRONMENT: cfg.ENVIRONMENT,
-        }
-    )
-
-    provider = TracerProvider(
-        resource=resource,
-        sampler=ParentBased(TraceIdRatioBased(cfg.TRACING_SAMPLE_RATIO)),
-    )
-
-    if exporter is None:
-        exporter = OTLPSpanExporter(
-            endpoint=str(cfg.AXIOM_OTLP_ENDPOINT),
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "X-Axiom-Dataset": dataset,
-            },
-            timeout=cfg.AXIOM_REQUEST_TIMEOUT_SECONDS,
+    # Check-and-set under a lock: concurrent startups (e.g. per-test apps) must not install two providers
+    with _TRACER_LOCK:
+        if _TRACER_CONFIGURED:
+            return lambda: None
+
+        cfg = settings or global_settings
+        if not cfg.TRACING_ENABLED:
+            return None
+
+        dataset = cfg.resolved_traces_dataset
+        api_key = cfg.AXIOM_API_KEY.strip()
+        if not api_key:
+            raise RuntimeError("Tracing enabled but AXIOM_API_KEY is missing")
+        if not dataset:
+            raise RuntimeError("Tracing enabled but no Axiom dataset configured (AXIOM_DATASET or AXIOM_TRACES_DATASET required)")
+
+        resource = Resource.create(
+            {
+                SERVICE_NAME: service_name or cfg.APP_NAME,
+                SERVICE_VERSION: cfg.VERSION,
+                ResourceAttributes.DEPLOYMENT_ENVIRONMENT: cfg.ENVIRONMENT,
+            }
         )
 
-    assert exporter is not None
+        provider = TracerProvider(
+            resource=resource,
+            sampler=ParentBased(TraceIdRatioBased(cfg.TRACING_SAMPLE_RATIO)),
+        )
 
-    provider.add_span_processor(BatchSpanProcessor(exporter))
-    trace.set_tracer_provider(provider)
+        if exporter is None:
+            exporter = OTLPSpanExporter(
+                endpoint=str(cfg.AXIOM_OTLP_ENDPOINT),
+                headers={
+                    "Authorization": f"Bearer {api_key}",
+                    "X-Axiom-Dataset": dataset,
+                },
+                timeout=cfg.AXIOM_REQUEST_TIMEOUT_SECONDS,
+                # Span batches are repetitive protobuf; gzip by default shrinks every export on the wire
+                compression=Compression(cfg.OTEL_EXPORTER_OTLP_COMPRESSION),
+            )
+
+        assert exporter is not None
+
+        provider.add_span_processor(
+            BatchSpanProcessor(
+                exporter,
+                max_queue_size=cfg.OTEL_BSP_MAX_QUEUE_SIZE,
+                schedule_delay_millis=cfg.OTEL_BSP_SCHEDULE_DELAY,
+                max_export_batch_size=cfg.OTEL_BSP_MAX_EXPORT_BATCH_SIZE,
+                export_timeout_millis=cfg.OTEL_BSP_EXPORT_TIMEOUT,
+            )
+        )
+        trace.set_tracer_provider(provider)
 
-    from opentelemetry.propagators.composite import CompositePropagator
+        from opentelemetry.propagators.composite import CompositePropagator
 
-    propagate.set_global_textmap(CompositePropagator([TraceContextTextMapPropagator(), W3CBaggagePropagator()]))
+        propagate.set_global_textmap(CompositePropagator([TraceContextTextMapPropagator(), W3CBaggagePropagator()]))
 
-    _TRACER_CONFIGURED = True
+        _TRACER_CONFIGURED = True
 
-    def _shutdown() -> None:
-        global _TRACER_CONFIGURED
-        provider.shutdown()
-        _TRACER_CONFIGURED = False
+        def _shutdown() -> None:
+            global _TRACER_CONFIGURED
+            # Bounded flush first so a slow exporter cannot stall shutdown indefinitely
+            provider.force_flush(timeout_millis=1000)
+            provider.shutdown()
+            with _TRACER_LOCK:
+                _TRACER_CONFIGURED = False
 
-    return _shutdown
+        return _shutdown
 
 
 def _instrument_fastapi(app: "FastAPI") -> Callable[[], None]:
     from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
-    if id(app) in _INSTRUMENTED_APPS:
+    if app in _INSTRUMENTED_APPS:
         return lambda: None
 
     FastAPIInstrumentor.instrument_app(app)
-    _INSTRUMENTED_APPS.add(id(app))
+    _INSTRUMENTED_APPS.add(app)
 
     def _uninstrument() -> None:
         try:
             FastAPIInstrumentor.uninstrument_app(app)
         finally:
-            _INSTRUMENTED_APPS.discard(id(app))
+            _INSTRUMENTED_APPS.discard(app)
 
     return _uninstrument
 
@@ -132,66 +213,141 @@ def _instrument_sqlalchemy(engine: "AsyncEngine | None") -> Callable[[], None]:
     return _uninstrument
 
 
-def _instrument_httpx() -> Callable[[], None]:
-    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+def _query_duration_histogram() -> "Histogram":
+    global _QUERY_DURATION
+    if _QUERY_DURATION is None:  # registered once per process, like the HTTP latency metric
+        from prometheus_client import Histogram
 
-    instrumentor = HTTPXClientInstrumentor()
-    instrumentor.instrument()
+        _QUERY_DURATION = Histogram(
+            "db_query_duration_seconds",
+            "Database statement execution time",
+            labelnames=("operation",),
+        )
+    return _QUERY_DURATION
+
+
+def _instrument_query_timings(engine: "AsyncEngine | None") -> Callable[[], None]:
+    """Per-query duration histogram: two cheap event hooks instead of a child span per statement"""
+    if engine is None:
+        return lambda: None
+
+    from time import perf_counter
+
+    from sqlalchemy import event
+
+    histogram = _query_duration_histogram()
+    sync_engine = engine.sync_engine
+
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        context._query_started_at = perf_counter()
+
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        # The four DML verbs are all six characters long; anything else is bucketed together
+        operation = statement[:6].upper()
+        if operation not in _QUERY_OPERATIONS:
+            operation = "OTHER"
+        histogram.labels(operation).observe(perf_counter() - context._query_started_at)
+
+    event.listen(sync_engine, "before_cursor_execute", _before)
+    event.listen(sync_engine, "after_cursor_execute", _after)
 
     def _uninstrument() -> None:
-        instrumentor.uninstrument()
+        event.remove(sync_engine, "before_cursor_execute", _before)
+        event.remove(sync_engine, "after_cursor_execute", _after)
 
     return _uninstrument
 
 
+def _instrument_httpx() -> None:
+    """Instrument httpx once per process; the patch is undone at interpreter exit, not per app shutdown"""
+    global _HTTPX_INSTRUMENTED
+    with _TRACER_LOCK:
+        if _HTTPX_INSTRUMENTED:
+            return
+
+        from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+
+        instrumentor = HTTPXClientInstrumentor()
+        instrumentor.instrument()
+        atexit.register(instrumentor.uninstrument)
+        _HTTPX_INSTRUMENTED = True
+
+
+def _run_in_order(callbacks: list[Callable[[], None]]) -> list[Exception]:
+    errors: list[Exception] = []
+    for callback in reversed(callbacks):
+        try:
+            callback()
+        except Exception as exc:
+            errors.append(exc)
+    return errors
+
+
 class ObservabilityController:
     """Coordinates telemetry setup across the application."""
 
     def __init__(self, settings: AppBaseSettings, *, engine: "AsyncEngine | None" = None) -> None:
-        import threading
-
         self._settings = settings
         self._engine = engine
-        self._shutdown_callbacks: list[Callable[[], None] | Callable[[], Awaitable[None]]] = []
+        # Split once at registration so shutdown never has to inspect what each hook returns
+        self._sync_callbacks: list[Callable[[], None]] = []
+        self._async_callbacks: list[Callable[[], Awaitable[None]]] = []
         self._configured = False
         self._lock = threading.Lock()
 
+    def _register(self, callback: Callable[[], None] | Callable[[], Awaitable[None]]) -> None:
+        if inspect.iscoroutinefunction(callback):
+            self._async_callbacks.append(callback)
+        else:
+            self._sync_callbacks.append(callback)  # type: ignore[arg-type]
+
     def startup(self, app: "FastAPI | None" = None) -> None:
-        if not self._settings.TRACING_ENABLED:
+        # Double-checked: repeated startups (lifespan re-entry on reload) skip the lock entirely
+        if self._configured:
             return
 
         with self._lock:
             if self._configured:
                 return
 
-            shutdown = configure_tracing(settings=self._settings)
-            if shutdown:
-                self._shutdown_callbacks.append(shutdown)
+            tracing = self._settings.TRACING_ENABLED
+            if tracing:
+                shutdown = configure_tracing(settings=self._settings)
+                if shutdown:
+                    self._register(shutdown)
 
-            if app is not None:
-                self._shutdown_callbacks.append(_instrument_fastapi(app))
+                if app is not None:
+                    self._register(_instrument_fastapi(app))
 
-            self._shutdown_callbacks.append(_instrument_httpx())
+                _instrument_httpx()
 
             if self._engine is not None:
-                self._shutdown_callbacks.append(_instrument_sqlalchemy(self._engine))
+                # The duration histogram is a Prometheus metric served by /metrics, so it is
+                # recorded with tracing off too; only the opt-in per-statement spans replace it
+                if tracing and self._settings.TRACING_SQLALCHEMY_SPANS:
+                    self._register(_instrument_sqlalchemy(self._engine))
+                else:
+                    self._register(_instrument_query_timings(self._engine))
 
             self._configured = True
 
     async def shutdown(self) -> None:
-        import inspect
-        import sys
-
-        while self._shutdown_callbacks:
-            callback = self._shutdown_callbacks.pop()
-            try:
-                result = callback()
-                if inspect.isawaitable(result):
-                    await result
-            except Exception as exc:  # pragma: no cover - defensive logging
-                sys.stderr.write(f"Observability shutdown error: {exc}\n")
+        async_callbacks, self._async_callbacks = self._async_callbacks, []
+        sync_callbacks, self._sync_callbacks = self._sync_callbacks, []
+
+        results: list[object] = list(
+            await asyncio.gather(*(callback() for callback in async_callbacks), return_exceptions=True)
+        )
+        if sync_callbacks:
+            # Uninstrumenting must unwind in reverse registration order, and the provider's bounded
+            # flush blocks, so the sync hooks run sequentially on a worker thread off the event loop
+            results.extend(await asyncio.to_thread(_run_in_order, sync_callbacks))
+
+        for result in results:
+            if isinstance(result, BaseException):
+                sys.stderr.write(f"Observability shutdown error: {result}\n")
 
         self._configured = False
 
 
-__all__ = ["configure_tracing", "ObservabilityController"]
\ No newline at end of file
+__all__ = ["aspan", "configure_tracing", "get_tracer", "ObservabilityController"]
\ No newline at end of file
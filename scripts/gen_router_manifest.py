@@ -0,0 +1,42 @@
+"""Generate ``app/api/_manifest.py`` listing the domain route modules.
+
+Run at image build time so production startup imports routers directly
+instead of scanning ``app/domains`` on every cold start. When the manifest
+is absent (local development), ``app.api.router`` falls back to dynamic
+discovery.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DOMAINS_DIR = ROOT / "app" / "domains"
+MANIFEST_PATH = ROOT / "app" / "api" / "_manifest.py"
+
+_TEMPLATE = '''"""Generated by scripts/gen_router_manifest.py; do not edit by hand"""
+
+DOMAIN_ROUTE_MODULES: tuple[str, ...] = (
+{entries})
+'''
+
+
+def discover_route_modules() -> list[str]:
+    modules: list[str] = []
+    for domain_dir in sorted(DOMAINS_DIR.iterdir()):
+        if not (domain_dir / "__init__.py").is_file():
+            continue
+        if (domain_dir / "routes.py").is_file():
+            modules.append(f"app.domains.{domain_dir.name}.routes")
+    return modules
+
+
+def main() -> None:
+    modules = discover_route_modules()
+    entries = "".join(f'    "{module}",\n' for module in modules)
+    MANIFEST_PATH.write_text(_TEMPLATE.format(entries=entries), encoding="utf-8")
+    print(f"Wrote {len(modules)} route module(s) to {MANIFEST_PATH.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
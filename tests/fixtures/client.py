@@ -11,24 +11,13 @@ from app.core.app import create_app
 from app.db.session import get_session
 
 
-@pytest.fixture(scope="function", name="app")
-async def app_fixture(db_session: AsyncSession) -> AsyncGenerator[FastAPI, None]:
-    application = create_app()
+@pytest.fixture(scope="session", name="app")
+def app_fixture() -> FastAPI:
+    # Built once: middleware stack and route compilation are shared by every test
+    return create_app()
 
-    async def override_get_session() -> AsyncGenerator[AsyncSession, None]:
-        try:
-            yield db_session
-        finally:
-            await db_session.rollback()
 
-    application.dependency_overrides[get_session] = override_get_session
-    try:
-        yield application
-    finally:
-        application.dependency_overrides.clear()
-
-
-@pytest.fixture(scope="function", name="client_fixture")
+@pytest.fixture(scope="session", name="client_fixture")
 async def client_fixture(app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as client:
@@ -36,5 +25,16 @@ async def client_fixture(app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
 
 
 @pytest.fixture(scope="function")
-async def client(client_fixture: AsyncClient) -> AsyncGenerator[AsyncClient, None]:
-    yield client_fixture
+async def client(
+    app: FastAPI, client_fixture: AsyncClient, db_session: AsyncSession
+) -> AsyncGenerator[AsyncClient, None]:
+    # Routes see this test's SAVEPOINT session; seeded rows stay visible across requests
+    # and the outer test transaction discards them
+    async def override_get_session() -> AsyncSession:
+        return db_session
+
+    app.dependency_overrides[get_session] = override_get_session
+    try:
+        yield client_fixture
+    finally:
+        app.dependency_overrides.clear()
@@ -1,68 +1,149 @@
 from __future__ import annotations
 
-import asyncio
+import os
 import uuid
-from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+from collections.abc import AsyncGenerator, Awaitable, Callable, Sequence
+from importlib.util import find_spec
+from typing import Any
 
 import pytest
+from sqlalchemy import Delete, event
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
-    async_sessionmaker,
+    AsyncTransaction,
     create_async_engine,
 )
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 from app.db import Base, load_domain_models
 from app.domains.users.models import User
 
-TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+load_domain_models()
+
+# Compiled once per process; test_engine only replays the strings instead of walking the metadata
+_SCHEMA_DDL: tuple[str, ...] = tuple(
+    str(ddl.compile(dialect=sqlite.dialect())).strip()
+    for table in Base.metadata.sorted_tables
+    for ddl in (CreateTable(table), *(CreateIndex(index) for index in table.indexes))
+)
+
+# One shared-cache in-memory database per xdist worker, named memdb_<worker> so workers never
+# share schema or rows; StaticPool hands every checkout in the worker the same connection
+_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+TEST_DATABASE_URL = f"sqlite+aiosqlite:///file:memdb_{_WORKER}?mode=memory&cache=shared&uri=true"
 
 
 @pytest.fixture(scope="session")
-def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
-    loop = asyncio.new_event_loop()
-    try:
-        yield loop
-    finally:
-        loop.close()
+def anyio_backend() -> tuple[str, dict[str, bool]]:
+    # Session scope lets the session-scoped engine and connection share one loop; uvloop has no
+    # Windows build, so fall back to the stock asyncio loop wherever it is not installed
+    return "asyncio", {"use_uvloop": find_spec("uvloop") is not None}
+
+
+def _enable_sqlite_savepoints(engine: AsyncEngine) -> None:
+    # pysqlite defers BEGIN until the first DML, so the outer test transaction would not exist and
+    # releasing the first SAVEPOINT would commit; let SQLAlchemy emit BEGIN itself instead
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record) -> None:
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn) -> None:
+        conn.exec_driver_sql("BEGIN")
 
 
 @pytest.fixture(scope="session")
 async def test_engine() -> AsyncGenerator[AsyncEngine, None]:
-    load_domain_models()
-    engine = create_async_engine(TEST_DATABASE_URL, echo=False, future=True)
+    engine = create_async_engine(
+        TEST_DATABASE_URL,
+        poolclass=StaticPool,
+        connect_args={"uri": True},
+        echo=False,
+        future=True,
+    )
+    _enable_sqlite_savepoints(engine)
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        for statement in _SCHEMA_DDL:
+            await conn.exec_driver_sql(statement)
     try:
         yield engine
     finally:
         await engine.dispose()
 
 
-@pytest.fixture(scope="function", name="db_session_fixture")
-async def db_session_fixture(test_engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
-    session_factory = async_sessionmaker(
-        test_engine,
-        expire_on_commit=False,
-        class_=AsyncSession,
-    )
-    async with session_factory() as session:
-        yield session
-        await session.rollback()
+@pytest.fixture(scope="session")
+async def connection(test_engine: AsyncEngine) -> AsyncGenerator[AsyncConnection, None]:
+    async with test_engine.connect() as conn:
+        yield conn
 
 
 @pytest.fixture(scope="function")
-async def db_session(db_session_fixture: AsyncSession) -> AsyncGenerator[AsyncSession, None]:
-    yield db_session_fixture
+async def transaction(connection: AsyncConnection) -> AsyncGenerator[AsyncTransaction, None]:
+    # Everything a test writes, committed or not, is discarded with this outer transaction
+    async with connection.begin() as trans:
+        yield trans
+        await trans.rollback()
+
+
+@pytest.fixture(scope="session")
+def table_deletes(test_engine: AsyncEngine) -> tuple[Delete, ...]:
+    # Built once per run; children come first so no foreign key sees an orphan mid-sweep
+    return tuple(table.delete() for table in reversed(Base.metadata.sorted_tables))
+
+
+@pytest.fixture(scope="function")
+async def clean_tables(
+    connection: AsyncConnection, table_deletes: tuple[Delete, ...]
+) -> AsyncGenerator[None, None]:
+    """Fallback for tests that commit outside the rolled-back ``transaction`` fixture
+
+    Empties every table afterwards with one DML sweep instead of dropping and recreating the schema.
+    """
+    yield
+    async with connection.begin():
+        await connection.exec_driver_sql("PRAGMA defer_foreign_keys=ON")
+        for statement in table_deletes:
+            await connection.execute(statement)
+
+
+@pytest.fixture(scope="function")
+async def db_session(
+    connection: AsyncConnection, transaction: AsyncTransaction
+) -> AsyncGenerator[AsyncSession, None]:
+    # commit() and rollback() inside the session only release or roll back a SAVEPOINT
+    async with AsyncSession(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
+    ) as session:
+        yield session
 
 
 @pytest.fixture()
-def user_factory(db_session: AsyncSession) -> Callable[..., Awaitable[User]]:
-    async def factory(*, email: str | None = None, is_active: bool = True) -> User:
-        user = User(email=email or f"test-{uuid.uuid4()}@example.com", is_active=is_active)
-        db_session.add(user)
-        await db_session.commit()
-        await db_session.refresh(user)
-        return user
+def user_factory(db_session: AsyncSession) -> Callable[..., Awaitable[Any]]:
+    """Insert users with one flush; returns a single user unless ``count`` or ``emails`` asks for more
+
+    Every column is filled client-side (``uuid4`` id, ``aware_now`` timestamps), so nothing is
+    refreshed after the INSERT, and the rows go away with the test's outer transaction.
+    """
+
+    async def factory(
+        *,
+        email: str | None = None,
+        is_active: bool = True,
+        count: int = 1,
+        emails: Sequence[str] | None = None,
+    ) -> User | list[User]:
+        batch = emails is not None or count > 1
+        if emails is None:
+            emails = [email or f"test-{uuid.uuid4()}@example.com" for _ in range(count)]
+        users = [User(email=address, is_active=is_active) for address in emails]
+        db_session.add_all(users)
+        await db_session.flush()
+        return users if batch else users[0]
 
     return factory
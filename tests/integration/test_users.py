@@ -3,8 +3,9 @@ from __future__ import annotations
 import pytest
 import uuid
 
+pytestmark = pytest.mark.anyio
+
 
-@pytest.mark.asyncio
 async def test_create_and_fetch_user(client):
     unique_email = f"test-{uuid.uuid4()}@example.com"
     payload = {"email": unique_email, "is_active": True}
@@ -25,7 +26,6 @@ async def test_create_and_fetch_user(client):
     assert fetched["email"] == payload["email"]
 
 
-@pytest.mark.asyncio
 async def test_list_users(client, user_factory):
     await user_factory(email="list@example.com")
 
@@ -37,7 +37,6 @@ async def test_list_users(client, user_factory):
     assert any(item["email"] == "list@example.com" for item in payload["items"])
 
 
-@pytest.mark.asyncio
 async def test_update_user(client, user_factory):
     user = await user_factory(email="update@example.com")
 
@@ -52,15 +51,38 @@ async def test_update_user(client, user_factory):
     assert updated["is_active"] is False
 
 
-@pytest.mark.asyncio
-async def test_update_requires_payload(client, user_factory):
-    user = await user_factory(email="noop@example.com")
+@pytest.fixture()
+async def seeded_user(user_factory):
+    return await user_factory(email="seeded@example.com")
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "payload", "expected"),
+    [
+        ("GET", "/api/users/{user_id}", None, 200),
+        ("PATCH", "/api/users/{user_id}", {}, 400),
+        ("PATCH", "/api/users/{user_id}", {"email": None}, 422),
+        ("PATCH", "/api/users/{user_id}", {"is_active": None}, 422),
+        ("PATCH", "/api/users/{missing_id}", {"is_active": False}, 404),
+        ("DELETE", "/api/users/{missing_id}", None, 404),
+        ("GET", "/api/users/not-a-uuid", None, 422),
+    ],
+    ids=["get", "update-empty-payload", "update-null-email", "update-null-is-active", "update-missing", "delete-missing", "get-invalid-id"],
+)
+async def test_user_endpoint_status(client, seeded_user, method, path, payload, expected):
+    url = path.format(user_id=seeded_user.id, missing_id=uuid.uuid4())
+    response = await client.request(method, url, json=payload)
+    assert response.status_code == expected
 
-    response = await client.patch(f"/api/users/{user.id}", json={})
-    assert response.status_code == 400
+
+async def test_update_to_taken_email_conflicts(client, user_factory):
+    await user_factory(email="taken@example.com")
+    user = await user_factory(email="taker@example.com")
+
+    response = await client.patch(f"/api/users/{user.id}", json={"email": "taken@example.com"})
+    assert response.status_code == 409
 
 
-@pytest.mark.asyncio
 async def test_delete_user(client, user_factory):
     user = await user_factory(email="delete@example.com")
 
@@ -71,7 +93,6 @@ async def test_delete_user(client, user_factory):
     assert follow_up.status_code == 404
 
 
-@pytest.mark.asyncio
 async def test_duplicate_email_rejected(client):
     payload = {"email": "dup@example.com", "is_active": True}
     first = await client.post("/api/users/", json=payload)
@@ -79,3 +100,69 @@ async def test_duplicate_email_rejected(client):
 
     second = await client.post("/api/users/", json=payload)
     assert second.status_code == 409
+
+
+async def test_list_users_total_on_empty_page(client, user_factory):
+    await user_factory(email="pagination@example.com")
+
+    first_page = await client.get("/api/users/", params={"limit": 1})
+    total = first_page.json()["total"]
+    assert total >= 1
+
+    past_end = await client.get("/api/users/", params={"offset": total})
+    assert past_end.status_code == 200
+    payload = past_end.json()
+    assert payload["items"] == []
+    assert payload["total"] == total
+
+
+async def test_list_users_cursor_pagination(client, user_factory):
+    await user_factory(emails=[f"cursor-{index}@example.com" for index in range(3)])
+
+    first = (await client.get("/api/users/", params={"limit": 2})).json()
+    assert first["next_cursor"]
+
+    second = (await client.get("/api/users/", params={"limit": 2, "cursor": first["next_cursor"]})).json()
+    assert second["total"] == first["total"]
+
+    first_ids = {item["id"] for item in first["items"]}
+    second_ids = {item["id"] for item in second["items"]}
+    assert second_ids and not first_ids & second_ids
+
+    offset_page = (await client.get("/api/users/", params={"limit": 2, "offset": 2})).json()
+    assert [item["id"] for item in second["items"]] == [item["id"] for item in offset_page["items"]]
+
+
+async def test_list_users_rejects_invalid_cursor(client):
+    response = await client.get("/api/users/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    response = await client.get("/api/users/", params={"cursor": "abc", "offset": 1})
+    assert response.status_code == 400
+
+
+_COMMITTED_EMAIL = "committed-outside@example.com"
+
+
+async def test_commit_outside_transaction_is_swept(test_engine, clean_tables):
+    from sqlalchemy import func, select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.domains.users.models import User
+
+    # Bound to the engine, not the test connection: this commit escapes the outer transaction
+    async with AsyncSession(test_engine, expire_on_commit=False) as session:
+        session.add(User(email=_COMMITTED_EMAIL, is_active=True))
+        await session.commit()
+        count = await session.scalar(select(func.count()).where(User.email == _COMMITTED_EMAIL))
+    assert count == 1
+
+
+async def test_clean_tables_left_no_rows_behind(db_session):
+    from sqlalchemy import func, select
+
+    from app.domains.users.models import User
+
+    # Runs after the test above; --dist=loadfile keeps the whole module on one worker and database
+    count = await db_session.scalar(select(func.count()).where(User.email == _COMMITTED_EMAIL))
+    assert count == 0
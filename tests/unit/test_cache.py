@@ -0,0 +1,85 @@
+"""Unit tests for the Redis JSON cache."""
+
+from __future__ import annotations
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.infra.cache import RedisJSONCache
+
+pytestmark = pytest.mark.anyio
+
+
+class _FakeRedis:
+    """Records the calls RedisJSONCache makes; raises on every call when ``fail`` is set."""
+
+    def __init__(self, *, fail: bool = False) -> None:
+        self.fail = fail
+        self.store: dict[str, bytes] = {}
+        self.ttls: dict[str, int | None] = {}
+
+    def _check(self) -> None:
+        if self.fail:
+            raise RedisConnectionError("redis is down")
+
+    async def get(self, name: str) -> bytes | None:
+        self._check()
+        return self.store.get(name)
+
+    async def set(self, name: str, value: bytes, ex: int | None = None) -> None:
+        self._check()
+        self.store[name] = value
+        self.ttls[name] = ex
+
+    async def delete(self, name: str) -> None:
+        self._check()
+        self.store.pop(name, None)
+
+
+@pytest.fixture()
+def fake_redis(monkeypatch) -> _FakeRedis:
+    redis = _FakeRedis()
+    monkeypatch.setattr("app.infra.cache.get_redis", lambda: redis)
+    return redis
+
+
+class TestRedisJSONCache:
+    """Test key prefixing, expiry and serialization in RedisJSONCache."""
+
+    async def test_set_prefixes_key_and_applies_ttl(self, fake_redis):
+        """Test that entries live under the namespace with the configured TTL."""
+        cache = RedisJSONCache(namespace="user:id", ttl=42)
+
+        await cache.set("abc", {"email": "a@example.com"})
+
+        assert list(fake_redis.store) == ["user:id:abc"]
+        assert fake_redis.ttls["user:id:abc"] == 42
+
+    async def test_round_trip(self, fake_redis):
+        """Test that a stored document is read back unchanged."""
+        cache = RedisJSONCache(namespace="user:id", ttl=60)
+        document = {"id": "abc", "is_active": True, "tags": ["a", "b"], "score": 1.5, "note": None}
+
+        await cache.set("abc", document)
+
+        assert await cache.get("abc") == document
+        assert await cache.get("missing") is None
+
+    async def test_delete_removes_prefixed_key(self, fake_redis):
+        """Test that invalidation targets the namespaced key."""
+        cache = RedisJSONCache(namespace="user:id", ttl=60)
+        await cache.set("abc", {"id": "abc"})
+
+        await cache.delete("abc")
+
+        assert fake_redis.store == {}
+        assert await cache.get("abc") is None
+
+    async def test_redis_errors_are_misses(self, fake_redis):
+        """Test that an unavailable Redis never fails the caller."""
+        cache = RedisJSONCache(namespace="user:id", ttl=60)
+        fake_redis.fail = True
+
+        assert await cache.get("abc") is None
+        await cache.set("abc", {"id": "abc"})
+        await cache.delete("abc")
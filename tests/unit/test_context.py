@@ -15,6 +15,8 @@ from app.core.context import (
     user_id_ctx,
 )
 
+pytestmark = pytest.mark.anyio
+
 
 class TestRequestContext:
     """Test request context management functions."""
@@ -123,28 +125,54 @@ class TestRequestContext:
         # Cleanup
         reset_request_context()
 
+    def test_unknown_keys_are_ignored(self):
+        """Test that fields outside the request context are dropped rather than raising."""
+        reset_request_context()
+
+        update_request_context(request_id="req-1", tenant="acme")
+
+        assert request_id_ctx.get() == "req-1"
+        assert "tenant" not in get_request_context()
+
+        # Cleanup
+        reset_request_context()
+
+    def test_reset_with_token_restores_previous_context(self):
+        """Test that resetting with a token restores the prior snapshot."""
+        reset_request_context()
+
+        update_request_context(request_id="outer")
+        token = update_request_context(request_id="inner", user_id="user-1")
+        assert request_id_ctx.get() == "inner"
+
+        reset_request_context(token)
+
+        assert request_id_ctx.get() == "outer"
+        assert user_id_ctx.get() is None
+
+        # Cleanup
+        reset_request_context()
+
 
 class TestMiddlewareIntegration:
     """Test context management with middleware."""
 
-    @pytest.mark.asyncio
     async def test_middleware_sets_context(self, client):
         """Test that middleware sets request context."""
         from app.core.context import request_id_ctx, trace_id_ctx
         
         # Make a request
-        response = await client.get("/api/health")
+        response = await client.get("/api/users/")
         
         # Verify response headers are set
         assert "x-request-id" in response.headers
         assert "x-trace-id" in response.headers
 
-    @pytest.mark.asyncio
     async def test_middleware_preserves_headers(self, client):
         """Test that middleware preserves provided headers."""
         # Make request with custom headers
         response = await client.get(
-            "/api/health",
+            "/api/users/",
             headers={
                 "x-request-id": "custom-req-id",
                 "x-trace-id": "custom-trace-id",
@@ -155,7 +183,6 @@ class TestMiddlewareIntegration:
         assert response.headers["x-request-id"] == "custom-req-id"
         assert response.headers["x-trace-id"] == "custom-trace-id"
 
-    @pytest.mark.asyncio
     async def test_middleware_resets_context_after_request(self, client):
         """Test that context is reset after request."""
         from app.core.context import request_id_ctx, trace_id_ctx
@@ -164,8 +191,16 @@ class TestMiddlewareIntegration:
         reset_request_context()
         
         # Make request
-        await client.get("/api/health")
+        await client.get("/api/users/")
         
         # Context should be reset after request completes
         # Note: This test may be flaky in async context
         # The middleware resets in finally block
+
+    async def test_middleware_skips_health_checks(self, client):
+        """Test that probe traffic bypasses the request context middleware."""
+        response = await client.get("/api/health")
+
+        assert response.status_code == 200
+        assert "x-request-id" not in response.headers
+        assert "x-trace-id" not in response.headers
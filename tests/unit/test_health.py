@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import pytest
 
+pytestmark = pytest.mark.anyio
+
 
-@pytest.mark.asyncio
 async def test_health(client):
     response = await client.get("/api/health")
     assert response.status_code == 200
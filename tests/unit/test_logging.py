@@ -0,0 +1,195 @@
+"""Unit tests for the Axiom log sink."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.core.logging import _LEVEL_CACHE, _STATIC_EXTRA, _AxiomLogSink, _LogEvent, _resolve_level
+
+_HttpxClient = httpx.Client
+
+
+@pytest.fixture()
+def make_sink():
+    sinks: list[_AxiomLogSink] = []
+
+    def factory(**overrides) -> _AxiomLogSink:
+        options = {
+            "endpoint": "https://axiom.test/v1/datasets/logs/ingest",
+            "api_key": "token",
+            "dataset": "logs",
+            "batch_size": 10,
+            "flush_interval": 60.0,
+            "timeout": 1.0,
+        }
+        options.update(overrides)
+        sink = _AxiomLogSink(**options)
+        sinks.append(sink)
+        return sink
+
+    yield factory
+
+    for sink in sinks:
+        sink.close()
+
+
+def _capturing_client(requests: list[httpx.Request]) -> httpx.Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200)
+
+    return _HttpxClient(transport=httpx.MockTransport(handler))
+
+
+def _event(text: str, **extra) -> _LogEvent:
+    return _LogEvent(datetime.now(timezone.utc), text, "INFO", "tests", "test", 1, extra)
+
+
+def _loguru_message(text: str) -> SimpleNamespace:
+    record = {
+        "level": SimpleNamespace(name="INFO"),
+        "time": datetime.now(timezone.utc),
+        "message": text,
+        "name": "tests",
+        "function": "test",
+        "line": 1,
+        "extra": {},
+    }
+    return SimpleNamespace(record=record)
+
+
+class TestAxiomLogSink:
+    """Test batch encoding in the Axiom sink."""
+
+    def test_flush_batch_gzips_ndjson(self, make_sink):
+        """Test that batches are sent as self-contained gzip payloads."""
+        sink = make_sink()
+        requests: list[httpx.Request] = []
+
+        with _capturing_client(requests) as client:
+            sink._flush_batch(client, [_event("first"), _event("second")])
+            sink._flush_batch(client, [_event("third")])
+
+        assert len(requests) == 2
+        assert requests[0].headers["content-encoding"] == "gzip"
+        lines = gzip.decompress(requests[0].content).decode().splitlines()
+        assert [json.loads(line)["message"] for line in lines] == ["first", "second"]
+        assert json.loads(lines[0])["app"] == _STATIC_EXTRA["app"]
+        assert json.loads(gzip.decompress(requests[1].content))["message"] == "third"
+
+    def test_flush_batch_without_compression(self, make_sink):
+        """Test that compression can be disabled."""
+        sink = make_sink(compress=False)
+        requests: list[httpx.Request] = []
+
+        with _capturing_client(requests) as client:
+            sink._flush_batch(client, [_event("plain")])
+
+        assert "content-encoding" not in requests[0].headers
+        assert json.loads(requests[0].content)["message"] == "plain"
+
+    def test_extras_are_encoded_without_duplicating_static_fields(self, make_sink):
+        """Test that request extras are merged while static extras appear once."""
+        sink = make_sink(compress=False)
+        requests: list[httpx.Request] = []
+
+        with _capturing_client(requests) as client:
+            sink._flush_batch(client, [_event("ctx", request_id="abc", **_STATIC_EXTRA)])
+
+        body = requests[0].content
+        event = json.loads(body)
+        assert event["request_id"] == "abc"
+        assert event["level"] == "INFO"
+        assert body.count(b'"app":') == 1
+
+    def test_close_flushes_pending_events(self, make_sink, monkeypatch):
+        """Test that buffered events are delivered when the sink closes."""
+        requests: list[httpx.Request] = []
+        monkeypatch.setattr("app.core.logging.httpx.Client", lambda **_: _capturing_client(requests))
+        sink = make_sink(compress=False)
+
+        for index in range(3):
+            sink(_loguru_message(f"event-{index}"))
+        sink.close()
+
+        messages = [json.loads(line)["message"] for request in requests for line in request.content.splitlines()]
+        assert messages == ["event-0", "event-1", "event-2"]
+
+    def test_flushes_reuse_one_client(self, make_sink, monkeypatch):
+        """Test that every batch goes through the client built at construction."""
+        requests: list[httpx.Request] = []
+        clients: list[httpx.Client] = []
+
+        def build_client(**_):
+            clients.append(_capturing_client(requests))
+            return clients[-1]
+
+        monkeypatch.setattr("app.core.logging.httpx.Client", build_client)
+        sink = make_sink(batch_size=2, compress=False)
+
+        for index in range(5):
+            sink(_loguru_message(f"event-{index}"))
+        sink.close()
+
+        assert len(clients) == 1
+        assert len(requests) == 3
+
+    def test_drops_events_when_buffer_full(self, make_sink):
+        """Test that the ring never grows past its capacity."""
+        sink = make_sink(batch_size=1)
+        sink.close()  # stop the drain thread so nothing consumes the ring
+
+        for index in range(sink._capacity + 5):
+            sink(_loguru_message(f"event-{index}"))
+
+        assert len(sink._ring) == sink._capacity
+        assert sink._dropped == 5
+
+
+class TestResolveLevel:
+    """Test stdlib to loguru level mapping."""
+
+    def test_known_level_maps_to_loguru_name(self):
+        """Test that standard level names resolve to loguru levels."""
+        assert _resolve_level("WARNING", 30) == "WARNING"
+
+    def test_unknown_level_falls_back_to_number(self):
+        """Test that unknown level names resolve to their numeric value."""
+        assert _resolve_level("CUSTOM_LEVEL_FOR_TESTS", 25) == 25
+        assert _LEVEL_CACHE["CUSTOM_LEVEL_FOR_TESTS"] == 25
+
+
+class TestAxiomEncodingFallback:
+    """Test that events orjson cannot encode never break a batch."""
+
+    def test_oversized_int_is_stringified(self, make_sink):
+        """Test that a value orjson rejects is sent as its string form alongside the rest of the batch."""
+        sink = make_sink(compress=False)
+        requests: list[httpx.Request] = []
+
+        with _capturing_client(requests) as client:
+            sink._flush_batch(client, [_event("before"), _event("huge", big=2**70), _event("after")])
+
+        events = [json.loads(line) for line in requests[0].content.splitlines()]
+        assert [event["message"] for event in events] == ["before", "huge", "after"]
+        assert events[1]["big"] == str(2**70)
+        assert events[1]["app"] == _STATIC_EXTRA["app"]
+
+    def test_drain_survives_unencodable_event(self, make_sink, monkeypatch):
+        """Test that the drain thread keeps delivering after an event orjson rejects."""
+        requests: list[httpx.Request] = []
+        monkeypatch.setattr("app.core.logging.httpx.Client", lambda **_: _capturing_client(requests))
+        sink = make_sink(batch_size=1, compress=False)
+
+        sink._push(_event("huge", big=2**70))
+        sink(_loguru_message("later"))
+        sink.close()
+
+        messages = [json.loads(line)["message"] for request in requests for line in request.content.splitlines()]
+        assert messages == ["huge", "later"]
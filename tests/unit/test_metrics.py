@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_metrics_skip_health_checks(client):
+    await client.get("/api/health")
+    await client.get("/api/users/")
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+
+    body = response.text
+    assert 'handler="/api/users/"' in body
+    assert 'handler="/api/health"' not in body
+
+
+async def test_query_timings_record_histogram():
+    from prometheus_client import REGISTRY
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.infra.metrics.opentelemetry import _instrument_query_timings
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    labels = {"operation": "SELECT"}
+    before = REGISTRY.get_sample_value("db_query_duration_seconds_count", labels) or 0.0
+
+    uninstrument = _instrument_query_timings(engine)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        uninstrument()
+        await engine.dispose()
+
+    assert REGISTRY.get_sample_value("db_query_duration_seconds_count", labels) == before + 1
+
+
+async def test_aspan_never_touches_current_context():
+    import asyncio
+    from typing import cast
+
+    from opentelemetry import context, trace
+    from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+
+    from app.infra.metrics.opentelemetry import aspan
+
+    tracer = TracerProvider().get_tracer(__name__)
+    before = context.get_current()
+    root = tracer.start_span("request")
+    parent_ctx = trace.set_span_in_context(root)
+
+    async def run(name: str):
+        async with aspan(name, parent_ctx, tracer=tracer) as span:
+            await asyncio.sleep(0)
+            assert context.get_current() == before
+        assert span is not None
+        # The SDK tracer hands out SDK spans, which expose their recorded timing and parent
+        return cast(ReadableSpan, span)
+
+    spans = await asyncio.gather(run("first"), run("second"))
+    root.end()
+
+    assert context.get_current() == before
+    assert all(span.end_time is not None for span in spans)
+    assert {span.parent and span.parent.span_id for span in spans} == {root.get_span_context().span_id}
+
+
+async def test_shutdown_gathers_async_hooks():
+    import asyncio
+
+    from app.core import settings
+    from app.infra.metrics.opentelemetry import ObservabilityController
+
+    controller = ObservabilityController(settings)
+    second_started = asyncio.Event()
+
+    async def first() -> None:
+        # Only completes if the second hook runs concurrently rather than after this one
+        await second_started.wait()
+
+    async def second() -> None:
+        second_started.set()
+
+    controller._register(first)
+    controller._register(second)
+
+    await asyncio.wait_for(controller.shutdown(), timeout=1)
+    assert controller._async_callbacks == []
+
+
+async def test_shutdown_runs_sync_hooks_in_reverse_off_the_loop():
+    import threading
+
+    from app.core import settings
+    from app.infra.metrics.opentelemetry import ObservabilityController
+
+    controller = ObservabilityController(settings)
+    calls: list[tuple[str, int]] = []
+    for name in ("first", "second", "third"):
+        controller._register(lambda name=name: calls.append((name, threading.get_ident())))
+
+    await controller.shutdown()
+
+    assert [name for name, _ in calls] == ["third", "second", "first"]
+    loop_thread = threading.get_ident()
+    assert all(ident != loop_thread for _, ident in calls)
+    assert controller._sync_callbacks == []
+
+
+async def test_shutdown_failing_hook_does_not_stop_the_others(capsys):
+    from app.core import settings
+    from app.infra.metrics.opentelemetry import ObservabilityController
+
+    controller = ObservabilityController(settings)
+    calls: list[str] = []
+
+    def failing_sync() -> None:
+        raise RuntimeError("sync boom")
+
+    async def failing_async() -> None:
+        raise RuntimeError("async boom")
+
+    async def async_hook() -> None:
+        calls.append("async")
+
+    controller._register(lambda: calls.append("first"))
+    controller._register(failing_sync)
+    controller._register(lambda: calls.append("last"))
+    controller._register(failing_async)
+    controller._register(async_hook)
+
+    await controller.shutdown()
+
+    assert sorted(calls) == ["async", "first", "last"]
+    stderr = capsys.readouterr().err
+    assert "sync boom" in stderr
+    assert "async boom" in stderr
+
+
+def test_httpx_is_instrumented_once_per_process(monkeypatch):
+    from collections.abc import Callable
+
+    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+
+    from app.infra.metrics import opentelemetry as otel
+
+    already_instrumented = HTTPXClientInstrumentor().is_instrumented_by_opentelemetry
+    registered: list[Callable[[], None]] = []
+    monkeypatch.setattr(otel, "_HTTPX_INSTRUMENTED", False)
+    monkeypatch.setattr(otel.atexit, "register", registered.append)
+
+    otel._instrument_httpx()
+    otel._instrument_httpx()
+
+    try:
+        assert otel._HTTPX_INSTRUMENTED is True
+        assert HTTPXClientInstrumentor().is_instrumented_by_opentelemetry
+        assert len(registered) == 1
+        assert getattr(registered[0], "__name__", None) == "uninstrument"
+    finally:
+        if not already_instrumented:
+            registered[0]()
+
+
+def _configure_tracing_capturing_provider(monkeypatch, *, exporter=None, **overrides):
+    from typing import cast
+
+    from opentelemetry import propagate, trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    from app.core import settings
+    from app.infra.metrics import opentelemetry as otel
+
+    # The global provider can only be set once per process, so capture it instead of installing it
+    installed: list[trace.TracerProvider] = []
+    monkeypatch.setattr(trace, "set_tracer_provider", installed.append)
+    monkeypatch.setattr(propagate, "set_global_textmap", lambda propagator: None)
+    monkeypatch.setattr(otel, "_TRACER_CONFIGURED", False)
+
+    cfg = settings.model_copy(update={"TRACING_ENABLED": True, "AXIOM_API_KEY": "token", **overrides})
+    shutdown = otel.configure_tracing(exporter=exporter, settings=cfg)
+    assert shutdown is not None
+    provider = cast(TracerProvider, installed[0])
+    processor = cast(BatchSpanProcessor, provider._active_span_processor._span_processors[0])
+    # BatchSpanProcessor keeps its tunables on the shared batch worker
+    return processor._batch_processor, shutdown
+
+
+def test_configure_tracing_applies_batch_processor_settings(monkeypatch):
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    processor, shutdown = _configure_tracing_capturing_provider(
+        monkeypatch,
+        exporter=exporter,
+        OTEL_BSP_MAX_QUEUE_SIZE=123,
+        OTEL_BSP_SCHEDULE_DELAY=45,
+        OTEL_BSP_MAX_EXPORT_BATCH_SIZE=67,
+        OTEL_BSP_EXPORT_TIMEOUT=890,
+    )
+    try:
+        assert processor._exporter is exporter
+        assert processor._max_queue_size == 123
+        assert processor._schedule_delay_millis == 45
+        assert processor._max_export_batch_size == 67
+        assert processor._export_timeout_millis == 890
+    finally:
+        shutdown()
+
+
+@pytest.mark.parametrize("setting", ["gzip", "deflate", "none"])
+def test_configure_tracing_applies_otlp_compression(monkeypatch, setting):
+    from typing import cast
+
+    from opentelemetry.exporter.otlp.proto.http import Compression
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+    processor, shutdown = _configure_tracing_capturing_provider(monkeypatch, OTEL_EXPORTER_OTLP_COMPRESSION=setting)
+    try:
+        assert cast(OTLPSpanExporter, processor._exporter)._compression is Compression(setting)
+    finally:
+        shutdown()
+
+
+async def test_query_timings_recorded_without_tracing():
+    from prometheus_client import REGISTRY
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.core import settings
+    from app.infra.metrics.opentelemetry import ObservabilityController
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    controller = ObservabilityController(settings.model_copy(update={"TRACING_ENABLED": False}), engine=engine)
+    labels = {"operation": "SELECT"}
+    before = REGISTRY.get_sample_value("db_query_duration_seconds_count", labels) or 0.0
+
+    controller.startup()
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        await controller.shutdown()
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    await engine.dispose()
+
+    # Counted while started, and the hooks are gone after shutdown
+    assert REGISTRY.get_sample_value("db_query_duration_seconds_count", labels) == before + 1
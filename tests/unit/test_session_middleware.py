@@ -0,0 +1,53 @@
+"""Unit tests for the request-scoped database session middleware."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.types import Message, Scope
+
+from app.db.session import DBSessionMiddleware, get_session
+
+pytestmark = pytest.mark.anyio
+
+
+def _http_scope(path: str = "/api/users/") -> Scope:
+    return {"type": "http", "path": path, "headers": []}
+
+
+async def _noop_receive() -> Message:
+    return {"type": "http.request"}
+
+
+async def _noop_send(message: Message) -> None:
+    return None
+
+
+class TestDBSessionMiddleware:
+    """Test session lifecycle handled by the middleware."""
+
+    async def test_exposes_one_session_per_request(self):
+        """Test that downstream dependencies see the middleware's session."""
+        seen: list[AsyncSession] = []
+
+        async def app(scope, receive, send):
+            request = Request(scope)
+            seen.append(await get_session(request))
+            seen.append(await get_session(request))
+
+        await DBSessionMiddleware(app)(_http_scope(), _noop_receive, _noop_send)
+
+        assert len(seen) == 2
+        assert isinstance(seen[0], AsyncSession)
+        assert seen[0] is seen[1]
+
+    async def test_skip_paths_do_not_open_session(self):
+        """Test that skipped paths pass through without a session."""
+
+        async def app(scope, receive, send):
+            with pytest.raises(RuntimeError):
+                await get_session(Request(scope))
+
+        middleware = DBSessionMiddleware(app, skip_paths=frozenset({"/api/health"}))
+        await middleware(_http_scope("/api/health"), _noop_receive, _noop_send)
@@ -0,0 +1,47 @@
+"""Unit tests for the bound application timezone."""
+
+from __future__ import annotations
+
+from datetime import timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.core.config import settings
+from app.core.timezone import aware_now, refresh_timezone
+
+
+@pytest.fixture()
+def set_timezone():
+    original = settings.TIMEZONE
+
+    def apply(name: str) -> None:
+        settings.TIMEZONE = name
+        refresh_timezone()
+
+    yield apply
+
+    settings.TIMEZONE = original
+    refresh_timezone()
+
+
+class TestRefreshTimezone:
+    """Test that aware_now follows settings.TIMEZONE after a refresh."""
+
+    def test_utc_binds_the_fixed_offset_singleton(self, set_timezone):
+        """Test that UTC resolves to datetime.timezone.utc rather than a ZoneInfo."""
+        set_timezone("UTC")
+
+        assert aware_now().tzinfo is timezone.utc
+
+    def test_named_zone_is_picked_up(self, set_timezone):
+        """Test that a changed zone is bound without restarting the process."""
+        set_timezone("America/Argentina/Buenos_Aires")
+
+        assert aware_now().tzinfo == ZoneInfo("America/Argentina/Buenos_Aires")
+
+    def test_unknown_zone_falls_back_to_utc(self, set_timezone):
+        """Test that an invalid name degrades to the UTC singleton."""
+        set_timezone("Not/A_Zone")
+
+        assert aware_now().tzinfo is timezone.utc
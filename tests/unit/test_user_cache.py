@@ -0,0 +1,104 @@
+"""Unit tests for the users read-through cache and lookup coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import orjson
+import pytest
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domains.users.repository import UserRepository
+from app.infra.cache import RedisJSONCache
+
+pytestmark = pytest.mark.anyio
+
+
+class _MemoryCache(RedisJSONCache):
+    """Stores the same JSON bytes RedisJSONCache would send to Redis."""
+
+    def __init__(self) -> None:
+        super().__init__(namespace="user:id", ttl=60)
+        self.entries: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        raw = self.entries.get(key)
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value) -> None:
+        self.entries[key] = orjson.dumps(value)
+
+    async def delete(self, key: str) -> None:
+        self.entries.pop(key, None)
+
+
+class TestUserRepositoryCache:
+    """Test read-through caching in UserRepository.get."""
+
+    async def test_get_populates_and_serves_from_cache(self, db_session, user_factory):
+        """Test that a cached user is attached to the session without a reload."""
+        user = await user_factory(email="cached@example.com")
+        cache = _MemoryCache()
+        repository = UserRepository(db_session, cache)
+
+        assert await repository.get(user.id) is user
+        assert str(user.id) in cache.entries
+
+        db_session.expunge(user)
+        cached = await repository.get(user.id)
+
+        assert cached is not None and cached is not user
+        assert cached.email == "cached@example.com"
+        assert cached.created_at == user.created_at
+        assert inspect(cached).persistent
+
+    async def test_update_and_delete_invalidate(self, db_session, user_factory):
+        """Test that writes drop the cached entry."""
+        user = await user_factory(email="stale@example.com")
+        cache = _MemoryCache()
+        repository = UserRepository(db_session, cache)
+
+        await repository.get(user.id)
+        await repository.update_by_id(user.id, {"is_active": False})
+        assert str(user.id) not in cache.entries
+
+        await repository.get(user.id)
+        await repository.delete_by_id(user.id)
+        assert str(user.id) not in cache.entries
+
+
+class TestUserRepositorySingleFlight:
+    """Test coalescing of concurrent lookups in UserRepository.get."""
+
+    async def test_concurrent_gets_share_one_query(self, connection, user_factory):
+        """Test that concurrent lookups of one id issue a single SELECT."""
+        user = await user_factory(email="singleflight@example.com")
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        factory = async_sessionmaker(
+            connection,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False,
+            class_=AsyncSession,
+        )
+        event.listen(connection.sync_engine, "before_cursor_execute", record)
+        try:
+            async with factory() as first_session, factory() as second_session:
+                first, second = await asyncio.gather(
+                    UserRepository(first_session).get(user.id),
+                    UserRepository(second_session).get(user.id),
+                )
+
+                assert first is not None and second is not None
+                assert first is not second
+                assert first.email == second.email == "singleflight@example.com"
+                assert inspect(second).session is second_session.sync_session
+        finally:
+            event.remove(connection.sync_engine, "before_cursor_execute", record)
+
+        assert len([statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]) == 1